@@ -18,12 +18,16 @@ MAC_IP = "192.168.123.99"  # Mac receiver IP
 RGB_PORT = 8889      # RGB stream port
 DEPTH_PORT = 8890    # Depth stream port
 CHUNK_SIZE = 60000   # 60KB chunks (safe for UDP)
+CHUNK_HEADER = struct.Struct('!III')  # sequence_id, chunk_index, total_chunks
 
 # ============================================================
 # Helper function: Send large data with chunking
 # ============================================================
+header_buf = bytearray(CHUNK_HEADER.size)  # Copied by the kernel on each sendmsg
+
 def send_chunked_data(sock, data, target_ip, target_port, sequence_id):
     """Split large data into chunks and send via UDP"""
+    data = memoryview(data)  # Chunks below are views, not copies
     data_size = len(data)
     total_chunks = (data_size + CHUNK_SIZE - 1) // CHUNK_SIZE  # Ceiling division
 
@@ -32,11 +36,13 @@ def send_chunked_data(sock, data, target_ip, target_port, sequence_id):
         end = min(start + CHUNK_SIZE, data_size)
         chunk_data = data[start:end]
 
-        # Create header: sequence_id (4 bytes) + chunk_index (4 bytes) + total_chunks (4 bytes)
-        header = struct.pack('!III', sequence_id, chunk_idx, total_chunks)
-        packet = header + chunk_data
+        # Header: sequence_id (4 bytes) + chunk_index (4 bytes) + total_chunks (4 bytes),
+        # packed into one reused buffer
+        CHUNK_HEADER.pack_into(header_buf, 0, sequence_id, chunk_idx, total_chunks)
 
-        sock.sendto(packet, (target_ip, target_port))
+        # Header and chunk go out as one datagram (gathered by the kernel,
+        # no concatenated copy)
+        sock.sendmsg([header_buf, chunk_data], [], 0, (target_ip, target_port))
 
 print("=" * 60)
 print("RealSense Network Streaming - Sender")
@@ -144,8 +150,8 @@ try:
         try:
             # Encode RGB as JPEG (lossy compression, ~10-20x smaller)
             _, rgb_encoded = cv2.imencode('.jpg', color_image, [cv2.IMWRITE_JPEG_QUALITY, 85])
-            # Convert to raw bytes with size header (4 bytes)
-            rgb_data = struct.pack('!I', len(rgb_encoded)) + rgb_encoded.tobytes()
+            # Size header (4 bytes) + JPEG bytes, joined in one copy
+            rgb_data = b''.join((struct.pack('!I', len(rgb_encoded)), rgb_encoded))
 
             # Send with chunking
             send_chunked_data(rgb_sock, rgb_data, MAC_IP, RGB_PORT, frame_count)
@@ -156,8 +162,8 @@ try:
         try:
             # Encode Depth as PNG (lossless compression for uint16)
             _, depth_encoded = cv2.imencode('.png', depth_image)
-            # Convert to raw bytes with size header (4 bytes)
-            depth_data = struct.pack('!I', len(depth_encoded)) + depth_encoded.tobytes()
+            # Size header (4 bytes) + PNG bytes, joined in one copy
+            depth_data = b''.join((struct.pack('!I', len(depth_encoded)), depth_encoded))
 
             # Send with chunking
             send_chunked_data(depth_sock, depth_data, MAC_IP, DEPTH_PORT, frame_count)
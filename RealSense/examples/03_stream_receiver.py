@@ -9,15 +9,22 @@ import cv2
 import sys
 import time
 import struct
-from threading import Thread, Lock
-from collections import defaultdict
+from threading import Thread
 
 # ============================================================
 # Configuration
 # ============================================================
 RGB_PORT = 8889      # RGB stream port
 DEPTH_PORT = 8890    # Depth stream port
-HEADER_SIZE = 12     # 3 x 4 bytes (sequence_id, chunk_index, total_chunks)
+CHUNK_HEADER = struct.Struct('!III')  # sequence_id, chunk_index, total_chunks
+HEADER_SIZE = CHUNK_HEADER.size
+CHUNK_SIZE = 60000   # Must match the sender's CHUNK_SIZE
+MAX_INFLIGHT = 4     # Frames reassembled concurrently
+MAX_FRAME_SIZE = 8 * 1024 * 1024  # Largest frame accepted (bounds the slot buffers)
+SEQ_RESTART_GAP = 64 # A sequence_id this far behind the newest means the sender restarted
+MAX_UDP_PACKET = 65535
+DISPLAY_IDLE_SLEEP = 0.001  # Display loop sleep when no new frame arrived (s)
+HAS_POLLKEY = hasattr(cv2, "pollKey")  # OpenCV >= 4.5.2 (else waitKey(1))
 
 print("=" * 60)
 print("RealSense Network Streaming - Receiver")
@@ -31,43 +38,109 @@ print("=" * 60)
 # ============================================================
 # Shared data
 # ============================================================
+# Newest decoded frames, each published by one reference assignment (atomic
+# under the GIL). Receivers never touch a frame after publishing it, so the
+# display reads and draws on it without a lock or a copy.
 rgb_image = None
 depth_image = None
-data_lock = Lock()
 
 frame_count = {"rgb": 0, "depth": 0}
 start_time = time.time()
 
+# ============================================================
+# Helper: Cached text overlay
+# ============================================================
+class TextOverlay:
+    """
+    cv2.putText result cached as a sprite + mask, re-rendered only when the text changes
+
+    Drawing pastes the cached pixels into the frame (np.copyto with the mask),
+    so an unchanged label costs a small copy instead of glyph rasterization.
+    """
+    def __init__(self, org, color, scale=0.7, thickness=2):
+        self.org = org
+        self.color = color
+        self.scale = scale
+        self.thickness = thickness
+        self.text = None
+
+    def _render(self, text):
+        (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, self.scale, self.thickness)
+        pad = 2 * self.thickness  # Stroke overhang beyond the getTextSize box
+        x, y = self.org
+        self.x0, self.y0 = max(x - pad, 0), max(y - h - pad, 0)
+        sprite = np.zeros((y + baseline + pad - self.y0, x + w + pad - self.x0, 3), dtype=np.uint8)
+        cv2.putText(sprite, text, (x - self.x0, y - self.y0), cv2.FONT_HERSHEY_SIMPLEX,
+                    self.scale, self.color, self.thickness)
+        self.sprite = sprite
+        self.mask = sprite.any(axis=2, keepdims=True)
+        self.text = text
+
+    def draw(self, image, text):
+        if text != self.text:
+            self._render(text)
+        roi = image[self.y0:self.y0 + self.sprite.shape[0], self.x0:self.x0 + self.sprite.shape[1]]
+        rh, rw = roi.shape[:2]
+        np.copyto(roi, self.sprite[:rh, :rw], where=self.mask[:rh, :rw])
+
 # ============================================================
 # Helper function: Receive chunked data
 # ============================================================
 def receive_chunked_data(sock):
-    """Receive and reassemble chunked data"""
-    chunks_buffer = defaultdict(dict)  # {sequence_id: {chunk_index: chunk_data}}
+    """
+    Receive and reassemble chunked UDP data
+
+    Each frame is written straight into a reusable bytearray slot (ring of
+    MAX_INFLIGHT, indexed by sequence_id) at chunk_index * CHUNK_SIZE, and
+    completion is tracked with a bitmask of received chunks. Yields a
+    memoryview of the slot, valid until the next iteration. Only frames newer
+    than the last one yielded come out; one completing late is dropped.
+    """
+    slot_seq = [-1] * MAX_INFLIGHT
+    slot_mask = [0] * MAX_INFLIGHT
+    slot_size = [0] * MAX_INFLIGHT
+    slot_buf = [bytearray() for _ in range(MAX_INFLIGHT)]
+    packet = bytearray(MAX_UDP_PACKET)
+    packet_view = memoryview(packet)
+    newest_seq = -1  # Last sequence_id yielded
+
+    def is_stale(seq, ref):
+        """seq is older than ref (not a restart of the sender's counter)"""
+        return ref - SEQ_RESTART_GAP < seq < ref
 
     while True:
         try:
-            packet, addr = sock.recvfrom(65535)  # Max UDP packet size
-
-            # Parse header
-            header = packet[:HEADER_SIZE]
-            sequence_id, chunk_index, total_chunks = struct.unpack('!III', header)
-            chunk_data = packet[HEADER_SIZE:]
-
-            # Store chunk
-            chunks_buffer[sequence_id][chunk_index] = chunk_data
-
-            # Check if all chunks received
-            if len(chunks_buffer[sequence_id]) == total_chunks:
-                # Reassemble data
-                complete_data = b''.join(chunks_buffer[sequence_id][i] for i in range(total_chunks))
-
-                # Clean up old sequences (keep only last 2)
-                sequences = sorted(chunks_buffer.keys())
-                for old_seq in sequences[:-2]:
-                    del chunks_buffer[old_seq]
-
-                yield complete_data
+            n = sock.recv_into(packet)
+            sequence_id, chunk_index, total_chunks = CHUNK_HEADER.unpack_from(packet)
+            chunk_len = n - HEADER_SIZE
+            if (chunk_index >= total_chunks or chunk_len > CHUNK_SIZE
+                    or total_chunks * CHUNK_SIZE > MAX_FRAME_SIZE):
+                continue  # Malformed (or a stray datagram claiming a huge frame)
+
+            i = sequence_id % MAX_INFLIGHT
+            if slot_seq[i] != sequence_id:
+                if is_stale(sequence_id, slot_seq[i]):
+                    continue  # Late chunk of a frame whose slot was reused
+                # New frame: take over the slot (drops any older partial frame)
+                slot_seq[i] = sequence_id
+                slot_mask[i] = 0
+                if len(slot_buf[i]) < total_chunks * CHUNK_SIZE:
+                    slot_buf[i] = bytearray(total_chunks * CHUNK_SIZE)
+            elif slot_mask[i] == -1:
+                continue  # Duplicate chunk of a frame already yielded
+
+            start = chunk_index * CHUNK_SIZE
+            slot_buf[i][start:start + chunk_len] = packet_view[HEADER_SIZE:n]
+            slot_mask[i] |= 1 << chunk_index
+            if chunk_index == total_chunks - 1:
+                slot_size[i] = start + chunk_len
+
+            if slot_mask[i] == (1 << total_chunks) - 1:
+                slot_mask[i] = -1
+                if is_stale(sequence_id, newest_seq):
+                    continue  # A newer frame was already shown
+                newest_seq = sequence_id
+                yield memoryview(slot_buf[i])[:slot_size[i]]
 
         except Exception as e:
             print(f"Chunk receive error: {e}")
@@ -88,18 +161,16 @@ def receive_rgb():
     for complete_data in receive_chunked_data(sock):
         try:
             # Extract size header and encoded data
-            size = struct.unpack('!I', complete_data[:4])[0]
-            encoded_bytes = complete_data[4:4+size]
+            size = struct.unpack_from('!I', complete_data)[0]
 
-            # Convert bytes to numpy array
-            encoded_image = np.frombuffer(encoded_bytes, dtype=np.uint8)
+            # View the encoded bytes in place (no slice copy)
+            encoded_image = np.frombuffer(complete_data, dtype=np.uint8, count=size, offset=4)
 
             # Decode JPEG
             image = cv2.imdecode(encoded_image, cv2.IMREAD_COLOR)
 
-            with data_lock:
-                rgb_image = image
-                frame_count["rgb"] += 1
+            rgb_image = image
+            frame_count["rgb"] += 1
 
         except Exception as e:
             print(f"RGB decode error: {e}")
@@ -119,18 +190,16 @@ def receive_depth():
     for complete_data in receive_chunked_data(sock):
         try:
             # Extract size header and encoded data
-            size = struct.unpack('!I', complete_data[:4])[0]
-            encoded_bytes = complete_data[4:4+size]
+            size = struct.unpack_from('!I', complete_data)[0]
 
-            # Convert bytes to numpy array
-            encoded_image = np.frombuffer(encoded_bytes, dtype=np.uint8)
+            # View the encoded bytes in place (no slice copy)
+            encoded_image = np.frombuffer(complete_data, dtype=np.uint8, count=size, offset=4)
 
             # Decode PNG (preserves uint16)
             image = cv2.imdecode(encoded_image, cv2.IMREAD_UNCHANGED)
 
-            with data_lock:
-                depth_image = image
-                frame_count["depth"] += 1
+            depth_image = image
+            frame_count["depth"] += 1
 
         except Exception as e:
             print(f"Depth decode error: {e}")
@@ -156,47 +225,54 @@ print("Press 'q' to quit")
 print("=" * 60)
 
 last_print_time = time.time()
+shown_rgb = None
+shown_depth = None
+depth_u8 = None        # Depth display scratch buffers, (re)allocated only
+depth_colormap = None  # when the depth frame size changes
+
+# Overlay texts are refreshed with the stats, once per second
+rgb_fps_overlay = TextOverlay((10, 30), (0, 255, 0))
+depth_fps_overlay = TextOverlay((10, 30), (255, 255, 255))
+depth_info_overlay = TextOverlay((10, 60), (255, 255, 255))
+rgb_fps_text = "RGB | FPS: 0.0"
+depth_fps_text = "Depth | FPS: 0.0"
+depth_info = "No valid depth"
 
 try:
     while True:
-        with data_lock:
-            current_rgb = rgb_image.copy() if rgb_image is not None else None
-            current_depth = depth_image.copy() if depth_image is not None else None
+        new_frame = False
+
+        # Redraw a window only when its receiver has published a new frame
+        current_rgb = rgb_image
+        current_depth = depth_image
 
         # Display RGB
-        if current_rgb is not None:
-            # Add FPS overlay
-            elapsed = time.time() - start_time
-            fps_rgb = frame_count["rgb"] / elapsed if elapsed > 0 else 0
+        if current_rgb is not None and current_rgb is not shown_rgb:
+            shown_rgb = current_rgb
+            new_frame = True
 
-            display_rgb = current_rgb.copy()
-            cv2.putText(display_rgb, f"RGB | FPS: {fps_rgb:.1f}", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            # Add FPS overlay
+            rgb_fps_overlay.draw(current_rgb, rgb_fps_text)
 
-            cv2.imshow("RealSense RGB", display_rgb)
+            cv2.imshow("RealSense RGB", current_rgb)
 
         # Display Depth
-        if current_depth is not None:
-            # Convert depth to colormap for visualization
-            # Normalize to 0-255 range (0-10m depth)
-            depth_normalized = np.clip(current_depth / 10000.0 * 255, 0, 255).astype(np.uint8)
-            depth_colormap = cv2.applyColorMap(depth_normalized, cv2.COLORMAP_JET)
+        if current_depth is not None and current_depth is not shown_depth:
+            shown_depth = current_depth
+            new_frame = True
 
-            # Add FPS and depth info overlay
-            elapsed = time.time() - start_time
-            fps_depth = frame_count["depth"] / elapsed if elapsed > 0 else 0
+            # Convert depth to colormap for visualization
+            if depth_u8 is None or depth_u8.shape != current_depth.shape:
+                depth_u8 = np.empty(current_depth.shape, dtype=np.uint8)
+                depth_colormap = np.empty(current_depth.shape + (3,), dtype=np.uint8)
 
-            valid_depth = current_depth[current_depth > 0]
-            if len(valid_depth) > 0:
-                depth_mean = np.mean(valid_depth) / 1000.0  # Convert to meters
-                depth_info = f"Mean: {depth_mean:.2f}m"
-            else:
-                depth_info = "No valid depth"
+            # Normalize to 0-255 range (0-10m depth), saturating, in one pass
+            cv2.convertScaleAbs(current_depth, depth_u8, alpha=255 / 10000.0)
+            cv2.applyColorMap(depth_u8, cv2.COLORMAP_JET, depth_colormap)
 
-            cv2.putText(depth_colormap, f"Depth | FPS: {fps_depth:.1f}", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            cv2.putText(depth_colormap, depth_info, (10, 60),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            # Add FPS and depth info overlay
+            depth_fps_overlay.draw(depth_colormap, depth_fps_text)
+            depth_info_overlay.draw(depth_colormap, depth_info)
 
             cv2.imshow("RealSense Depth", depth_colormap)
 
@@ -210,10 +286,26 @@ try:
             print(f"RGB: {frame_count['rgb']:5d} frames ({fps_rgb:5.1f} fps) | "
                   f"Depth: {frame_count['depth']:5d} frames ({fps_depth:5.1f} fps)")
 
+            rgb_fps_text = f"RGB | FPS: {fps_rgb:.1f}"
+            depth_fps_text = f"Depth | FPS: {fps_depth:.1f}"
+            if current_depth is not None:
+                valid_depth = current_depth[current_depth > 0]
+                if len(valid_depth) > 0:
+                    depth_mean = np.mean(valid_depth) / 1000.0  # Convert to meters
+                    depth_info = f"Mean: {depth_mean:.2f}m"
+                else:
+                    depth_info = "No valid depth"
+
             last_print_time = current_time
 
         # Check for quit
-        key = cv2.waitKey(1) & 0xFF
+        if HAS_POLLKEY:
+            # Pump GUI events without waitKey's sleep; idle only between frames
+            key = cv2.pollKey() & 0xFF
+            if not new_frame:
+                time.sleep(DISPLAY_IDLE_SLEEP)
+        else:
+            key = cv2.waitKey(1) & 0xFF
         if key == ord('q'):
             break
 
@@ -3,6 +3,7 @@
 # Usage:
 #   ./build.sh         # Quick rebuild (only changed files)
 #   ./build.sh clean   # Full rebuild (from scratch)
+#   ./build.sh pgo     # Full rebuild with profile-guided optimization + LTO
 
 set -e  # Exit on error
 
@@ -26,6 +27,31 @@ if [ "$1" == "clean" ]; then
     echo ""
     echo "Compiling..."
     make -j$(nproc)
+elif [ "$1" == "pgo" ]; then
+    echo "========================================"
+    echo "PGO + LTO Build"
+    echo "========================================"
+
+    echo "Cleaning build directory..."
+    rm -rf build
+    mkdir build
+    cd build
+    PGO_DIR="$(pwd)/pgo"
+
+    echo ""
+    echo "Stage 1/3: instrumented build..."
+    cmake .. -DCMAKE_BUILD_TYPE=Release -DPGO_MODE=generate -DPGO_DIR="$PGO_DIR"
+    make -j$(nproc)
+
+    echo ""
+    echo "Stage 2/3: training run (profile_phase2.py)..."
+    (cd ../.. && python3 profile_phase2.py)
+
+    echo ""
+    echo "Stage 3/3: optimized rebuild (-fprofile-use -flto -march=native)..."
+    cmake .. -DPGO_MODE=use
+    make clean
+    make -j$(nproc)
 else
     echo "========================================"
     echo "Quick Rebuild"
@@ -47,7 +73,7 @@ fi
 # Copy .so files
 echo ""
 echo "Copying .so files..."
-cp *.so ../../
+cp *.so ../../ 2>/dev/null || true  # modules are normally written to slam_rx/ directly
 
 echo ""
 echo "========================================"
@@ -61,3 +87,10 @@ echo ""
 echo "Testing modules..."
 cd ../..
 python3 -c "from lidar_protocol_cpp import LidarProtocol; from frame_builder_cpp import FrameBuilder; print('✅ Both modules work!')"
+
+# Report PGO result with the same workload used for training
+if [ "$1" == "pgo" ]; then
+    echo ""
+    echo "Benchmark (PGO build)..."
+    python3 profile_phase2.py
+fi
@@ -13,6 +13,14 @@
 //
 // Key optimization: Pre-allocated buffer eliminates np.vstack overhead
 
+// Hot-path hint for the per-packet copy (lets PGO/LTO collapse it into
+// add_packet, and with it most of the pybind11 trampoline overhead)
+#if defined(__GNUC__) || defined(__clang__)
+#define FRAME_BUILDER_HOT __attribute__((hot, always_inline)) inline
+#else
+#define FRAME_BUILDER_HOT inline
+#endif
+
 namespace frame_builder {
 
 // Forward declarations
@@ -132,7 +140,7 @@ private:
 
     // Internal helpers
     std::optional<Frame> close_current_frame(bool debug);
-    void add_to_current_frame(
+    FRAME_BUILDER_HOT void add_to_current_frame(
         int64_t device_ts_ns,
         const float* xyz_data,
         size_t point_count,
@@ -66,11 +66,11 @@ struct ParsedPacket {
     uint16_t flags;
     uint32_t crc32;
 
-    // points: (N, 4) - x, y, z, intensity
-    std::vector<float> points_data;
-
-    // xyz: (N, 3) - x, y, z only
+    // xyz: (N, 3) - x, y, z
     std::vector<float> xyz_data;
+
+    // intensity: (N,) - raw uint8, not widened
+    std::vector<uint8_t> intensity_data;
 };
 
 // Main parser class
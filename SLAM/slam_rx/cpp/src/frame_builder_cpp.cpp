@@ -6,6 +6,13 @@
 #include <chrono>
 #include <atomic>
 
+#ifdef __linux__
+#include <linux/perf_event.h>
+#include <sys/ioctl.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+#endif
+
 namespace frame_builder {
 
 // ============================================================================
@@ -20,6 +27,172 @@ static std::atomic<uint64_t> g_add_to_frame_total_us{0};
 static std::atomic<uint64_t> g_close_frame_total_us{0};
 static std::atomic<uint64_t> g_memcpy_total_us{0};
 
+// The first packets pay page faults on the point buffer, I-cache fill and
+// branch-predictor training; keep them out of the timing averages so the
+// printed μs/call reflects steady state. Call counts still include them.
+static constexpr size_t kProfileWarmupCalls = 100;
+static std::atomic<size_t> g_add_to_frame_timed{0};
+static std::atomic<size_t> g_memcpy_timed{0};
+
+// ============================================================================
+// Hardware performance counters (perf_event_open)
+// ============================================================================
+//
+// Wall-clock μs deltas jitter with context switches; cycles/instructions/
+// cache-misses per call do not. Counters are read around one call out of
+// every `sample_every` so the two read() syscalls stay well under 1% of the
+// hot path. Counters are per-thread and opened lazily; if perf_event_open is
+// unavailable (non-Linux, perf_event_paranoid, containers) sampling is a no-op.
+
+struct PerfPhase {
+    const char* name;
+    size_t sample_every;
+    size_t warmup;
+    std::atomic<size_t> calls{0};
+    std::atomic<size_t> samples{0};
+    std::atomic<uint64_t> cycles{0};
+    std::atomic<uint64_t> instructions{0};
+    std::atomic<uint64_t> cache_misses{0};
+
+    PerfPhase(const char* n, size_t every, size_t warm)
+        : name(n), sample_every(every), warmup(warm) {}
+};
+
+static PerfPhase g_perf_add_to_frame("add_to_frame", 1000, kProfileWarmupCalls);
+static PerfPhase g_perf_close_frame("close_frame", 1, 0);  // ~10 Hz, sample all
+static std::atomic<bool> g_perf_available{true};
+
+struct PerfReading {
+    uint64_t cycles = 0;
+    uint64_t instructions = 0;
+    uint64_t cache_misses = 0;
+};
+
+#ifdef __linux__
+class PerfCounterGroup {
+public:
+    PerfCounterGroup() {
+        leader_fd_ = open_counter(PERF_COUNT_HW_CPU_CYCLES, -1);
+        if (leader_fd_ < 0) {
+            return;
+        }
+        instr_fd_ = open_counter(PERF_COUNT_HW_INSTRUCTIONS, leader_fd_);
+        miss_fd_ = open_counter(PERF_COUNT_HW_CACHE_MISSES, leader_fd_);
+        if (instr_fd_ < 0 || miss_fd_ < 0) {
+            close_all();
+            return;
+        }
+        ioctl(leader_fd_, PERF_EVENT_IOC_RESET, PERF_IOC_FLAG_GROUP);
+        ioctl(leader_fd_, PERF_EVENT_IOC_ENABLE, PERF_IOC_FLAG_GROUP);
+    }
+
+    ~PerfCounterGroup() { close_all(); }
+
+    bool ok() const { return leader_fd_ >= 0; }
+
+    bool read_counters(PerfReading& out) const {
+        // PERF_FORMAT_GROUP layout: { nr, values[nr] } in open order
+        uint64_t buf[4];
+        if (::read(leader_fd_, buf, sizeof(buf)) != static_cast<ssize_t>(sizeof(buf))) {
+            return false;
+        }
+        out.cycles = buf[1];
+        out.instructions = buf[2];
+        out.cache_misses = buf[3];
+        return true;
+    }
+
+private:
+    int leader_fd_ = -1;
+    int instr_fd_ = -1;
+    int miss_fd_ = -1;
+
+    static int open_counter(uint64_t config, int group_fd) {
+        perf_event_attr attr;
+        std::memset(&attr, 0, sizeof(attr));
+        attr.type = PERF_TYPE_HARDWARE;
+        attr.size = sizeof(attr);
+        attr.config = config;
+        attr.disabled = (group_fd == -1) ? 1 : 0;
+        attr.exclude_kernel = 1;
+        attr.exclude_hv = 1;
+        attr.read_format = PERF_FORMAT_GROUP;
+        return static_cast<int>(syscall(SYS_perf_event_open, &attr, 0, -1, group_fd, 0));
+    }
+
+    void close_all() {
+        if (miss_fd_ >= 0) { ::close(miss_fd_); miss_fd_ = -1; }
+        if (instr_fd_ >= 0) { ::close(instr_fd_); instr_fd_ = -1; }
+        if (leader_fd_ >= 0) { ::close(leader_fd_); leader_fd_ = -1; }
+    }
+};
+
+static const PerfCounterGroup* thread_perf_counters() {
+    if (!g_perf_available.load(std::memory_order_relaxed)) {
+        return nullptr;
+    }
+    thread_local PerfCounterGroup group;
+    if (!group.ok()) {
+        g_perf_available = false;
+        return nullptr;
+    }
+    return &group;
+}
+#endif
+
+// RAII sampler: reads counters on entry/exit for 1-in-N calls of a phase
+class PerfSample {
+public:
+    explicit PerfSample(PerfPhase& phase) : phase_(phase) {
+#ifdef __linux__
+        const size_t call = phase_.calls++;
+        if (call < phase_.warmup || call % phase_.sample_every != 0) {
+            return;
+        }
+        group_ = thread_perf_counters();
+        if (group_ && !group_->read_counters(start_)) {
+            group_ = nullptr;
+        }
+#endif
+    }
+
+    ~PerfSample() {
+#ifdef __linux__
+        PerfReading end;
+        if (!group_ || !group_->read_counters(end)) {
+            return;
+        }
+        phase_.samples++;
+        phase_.cycles += end.cycles - start_.cycles;
+        phase_.instructions += end.instructions - start_.instructions;
+        phase_.cache_misses += end.cache_misses - start_.cache_misses;
+#endif
+    }
+
+private:
+    PerfPhase& phase_;
+#ifdef __linux__
+    const PerfCounterGroup* group_ = nullptr;
+    PerfReading start_;
+#endif
+};
+
+static void print_perf_phase(const PerfPhase& phase) {
+    const size_t samples = phase.samples;
+    if (samples == 0) {
+        std::cerr << "  " << phase.name << ": no samples\n";
+        return;
+    }
+    const double cycles = static_cast<double>(phase.cycles) / samples;
+    const double instructions = static_cast<double>(phase.instructions) / samples;
+    const double misses = static_cast<double>(phase.cache_misses) / samples;
+    std::cerr << "  " << phase.name << " (" << samples << " samples, 1/"
+              << phase.sample_every << "): "
+              << cycles << " cycles/call, "
+              << (cycles > 0 ? instructions / cycles : 0.0) << " IPC, "
+              << misses << " cache-misses/call\n";
+}
+
 #define PROFILE_START() auto _prof_start = std::chrono::high_resolution_clock::now()
 #define PROFILE_END(name, counter) \
     do { \
@@ -235,8 +408,9 @@ void FrameBuilder::add_to_current_frame(
     uint32_t seq,
     bool debug)
 {
+    PerfSample _perf(g_perf_add_to_frame);
     PROFILE_START();
-    g_add_to_frame_calls++;
+    const bool timed = g_add_to_frame_calls++ >= kProfileWarmupCalls;
 
     // Sequence tracking (detect gaps and reorders)
     if (last_seq_.has_value()) {
@@ -286,7 +460,10 @@ void FrameBuilder::add_to_current_frame(
 
         g_memcpy_calls++;
         g_memcpy_bytes += bytes;
-        g_memcpy_total_us += memcpy_us;
+        if (timed) {
+            g_memcpy_timed++;
+            g_memcpy_total_us += memcpy_us;
+        }
     }
 
     // Update metadata
@@ -299,10 +476,14 @@ void FrameBuilder::add_to_current_frame(
     stats_.packets_added++;
     stats_.points_added += point_count;
 
-    PROFILE_END("add_to_frame", g_add_to_frame_total_us);
+    if (timed) {
+        g_add_to_frame_timed++;
+        PROFILE_END("add_to_frame", g_add_to_frame_total_us);
+    }
 }
 
 std::optional<Frame> FrameBuilder::close_current_frame(bool debug) {
+    PerfSample _perf(g_perf_close_frame);
     PROFILE_START();
     g_close_frame_calls++;
 
@@ -334,6 +515,7 @@ std::optional<Frame> FrameBuilder::close_current_frame(bool debug) {
         auto memcpy_us = std::chrono::duration_cast<std::chrono::microseconds>(memcpy_end - memcpy_start).count();
 
         g_memcpy_calls++;
+        g_memcpy_timed++;
         g_memcpy_bytes += bytes;
         g_memcpy_total_us += memcpy_us;
     }
@@ -378,9 +560,10 @@ void print_profiling_stats() {
     std::cerr << "  add_to_frame: " << g_add_to_frame_calls << " calls\n";
     std::cerr << "  close_frame: " << g_close_frame_calls << " calls\n";
 
-    if (g_add_to_frame_calls > 0) {
-        double avg_add = static_cast<double>(g_add_to_frame_total_us) / g_add_to_frame_calls;
-        std::cerr << "  avg add_to_frame: " << avg_add << " μs/call\n";
+    if (g_add_to_frame_timed > 0) {
+        double avg_add = static_cast<double>(g_add_to_frame_total_us) / g_add_to_frame_timed;
+        std::cerr << "  avg add_to_frame: " << avg_add << " μs/call (first "
+                  << kProfileWarmupCalls << " calls excluded)\n";
     }
 
     if (g_close_frame_calls > 0) {
@@ -394,12 +577,20 @@ void print_profiling_stats() {
               << (g_memcpy_bytes / 1024.0 / 1024.0) << " MB)\n";
     std::cerr << "  Total time: " << g_memcpy_total_us << " μs\n";
 
-    if (g_memcpy_calls > 0) {
+    if (g_memcpy_calls > 0 && g_memcpy_timed > 0) {
         double avg_bytes = static_cast<double>(g_memcpy_bytes) / g_memcpy_calls;
-        double avg_us = static_cast<double>(g_memcpy_total_us) / g_memcpy_calls;
+        double avg_us = static_cast<double>(g_memcpy_total_us) / g_memcpy_timed;
         std::cerr << "  avg per call: " << avg_bytes << " bytes, " << avg_us << " μs\n";
     }
 
+    std::cerr << "\nHardware Counters (perf_event_open):\n";
+    if (!g_perf_available) {
+        std::cerr << "  unavailable (check /proc/sys/kernel/perf_event_paranoid)\n";
+    } else {
+        print_perf_phase(g_perf_add_to_frame);
+        print_perf_phase(g_perf_close_frame);
+    }
+
     std::cerr << "========================================\n\n";
 }
 
@@ -5,6 +5,7 @@
 #include <chrono>
 #include <atomic>
 #include <iostream>
+#include <mutex>
 
 namespace py = pybind11;
 using namespace frame_builder;
@@ -16,6 +17,8 @@ static std::atomic<uint64_t> g_pybind_cpp_call_us{0};
 static std::atomic<uint64_t> g_pybind_dict_us{0};
 static std::atomic<uint64_t> g_pybind_sync_us{0};
 static std::atomic<size_t> g_pybind_calls{0};
+static std::atomic<size_t> g_pybind_timed_calls{0};
+static constexpr size_t kPybindWarmupCalls = 100;  // excluded from averages
 static std::atomic<size_t> g_pybind_dict_creates{0};
 
 // ============================================================================
@@ -80,7 +83,7 @@ public:
                           uint32_t seq,
                           bool debug = false)
     {
-        g_pybind_calls++;
+        const bool timed = g_pybind_calls++ >= kPybindWarmupCalls;
         auto t0 = std::chrono::high_resolution_clock::now();
 
         // Validate input array
@@ -94,8 +97,14 @@ public:
         size_t point_count = points_xyz.shape(0);
         auto t2 = std::chrono::high_resolution_clock::now();
 
-        // Call C++ method
-        auto result = builder_.add_packet(device_ts_ns, xyz_data, point_count, seq, debug);
+        // Call C++ method without the GIL so Python threads (e.g. recvfrom)
+        // can run while the points are copied into the frame buffer
+        std::optional<Frame> result;
+        {
+            py::gil_scoped_release release;
+            std::lock_guard<std::mutex> lock(builder_mutex_);
+            result = builder_.add_packet(device_ts_ns, xyz_data, point_count, seq, debug);
+        }
         auto t3 = std::chrono::high_resolution_clock::now();
 
         // Sync stats only when frame is closed (major performance optimization)
@@ -104,11 +113,14 @@ public:
         }
         auto t4 = std::chrono::high_resolution_clock::now();
 
-        // Record timing
-        g_pybind_validate_us += std::chrono::duration_cast<std::chrono::microseconds>(t1 - t0).count();
-        g_pybind_getptr_us += std::chrono::duration_cast<std::chrono::microseconds>(t2 - t1).count();
-        g_pybind_cpp_call_us += std::chrono::duration_cast<std::chrono::microseconds>(t3 - t2).count();
-        g_pybind_sync_us += std::chrono::duration_cast<std::chrono::microseconds>(t4 - t3).count();
+        // Record timing (steady state only)
+        if (timed) {
+            g_pybind_timed_calls++;
+            g_pybind_validate_us += std::chrono::duration_cast<std::chrono::microseconds>(t1 - t0).count();
+            g_pybind_getptr_us += std::chrono::duration_cast<std::chrono::microseconds>(t2 - t1).count();
+            g_pybind_cpp_call_us += std::chrono::duration_cast<std::chrono::microseconds>(t3 - t2).count();
+            g_pybind_sync_us += std::chrono::duration_cast<std::chrono::microseconds>(t4 - t3).count();
+        }
 
         // Return None or Frame dict
         if (!result.has_value()) {
@@ -180,15 +192,20 @@ public:
             seq_vec.push_back(seq_batch[i].cast<uint32_t>());
         }
 
-        // Call C++ batch method
-        auto frames = builder_.add_packets_batch(
-            ts_vec.data(),
-            xyz_ptrs.data(),
-            point_counts.data(),
-            seq_vec.data(),
-            batch_size,
-            debug
-        );
+        // Call C++ batch method (GIL released, arrays kept alive above)
+        std::vector<Frame> frames;
+        {
+            py::gil_scoped_release release;
+            std::lock_guard<std::mutex> lock(builder_mutex_);
+            frames = builder_.add_packets_batch(
+                ts_vec.data(),
+                xyz_ptrs.data(),
+                point_counts.data(),
+                seq_vec.data(),
+                batch_size,
+                debug
+            );
+        }
 
         // Convert frames to Python dicts
         py::list result;
@@ -206,7 +223,11 @@ public:
 
     // Flush remaining frame
     py::object flush(bool debug = false) {
-        auto result = builder_.flush(debug);
+        std::optional<Frame> result;
+        {
+            std::lock_guard<std::mutex> lock(builder_mutex_);
+            result = builder_.flush(debug);
+        }
 
         // Sync stats
         if (!external_stats_.is_none()) {
@@ -222,7 +243,10 @@ public:
 
     // Reset state
     void reset() {
-        builder_.reset();
+        {
+            std::lock_guard<std::mutex> lock(builder_mutex_);
+            builder_.reset();
+        }
 
         if (!external_stats_.is_none()) {
             sync_stats_to_python();
@@ -238,10 +262,15 @@ private:
     FrameBuilderStats stats_;           // Internal C++ stats
     py::object external_stats_;         // Optional external Python stats object
     FrameBuilder builder_;              // C++ frame builder
+    std::mutex builder_mutex_;          // Guards builder_ + stats_ while the GIL is released
 
     // Sync internal C++ stats to external Python stats object
     void sync_stats_to_python() {
-        const auto& s = builder_.stats();
+        FrameBuilderStats s;
+        {
+            std::lock_guard<std::mutex> lock(builder_mutex_);
+            s = builder_.stats();
+        }
         external_stats_.attr("frames_built") = s.frames_built;
         external_stats_.attr("packets_added") = s.packets_added;
         external_stats_.attr("points_added") = s.points_added;
@@ -264,13 +293,14 @@ void print_pybind_profiling_stats() {
     std::cerr << "Total add_packet calls: " << g_pybind_calls << "\n";
     std::cerr << "Frame dicts created: " << g_pybind_dict_creates << "\n";
 
-    if (g_pybind_calls > 0) {
-        double avg_validate = static_cast<double>(g_pybind_validate_us) / g_pybind_calls;
-        double avg_getptr = static_cast<double>(g_pybind_getptr_us) / g_pybind_calls;
-        double avg_cpp = static_cast<double>(g_pybind_cpp_call_us) / g_pybind_calls;
-        double avg_sync = static_cast<double>(g_pybind_sync_us) / g_pybind_calls;
+    if (g_pybind_timed_calls > 0) {
+        double avg_validate = static_cast<double>(g_pybind_validate_us) / g_pybind_timed_calls;
+        double avg_getptr = static_cast<double>(g_pybind_getptr_us) / g_pybind_timed_calls;
+        double avg_cpp = static_cast<double>(g_pybind_cpp_call_us) / g_pybind_timed_calls;
+        double avg_sync = static_cast<double>(g_pybind_sync_us) / g_pybind_timed_calls;
 
-        std::cerr << "\nAverage per add_packet call:\n";
+        std::cerr << "\nAverage per add_packet call (first " << kPybindWarmupCalls
+                  << " excluded):\n";
         std::cerr << "  Validation:  " << avg_validate << " μs\n";
         std::cerr << "  Get pointer: " << avg_getptr << " μs\n";
         std::cerr << "  C++ call:    " << avg_cpp << " μs\n";
@@ -211,27 +211,22 @@ std::optional<ParsedPacket> LidarProtocol::parse_datagram(
     result.flags = header->flags;
     result.crc32 = header->crc32;
 
-    // Pre-allocate arrays
+    // Size arrays once, then fill by index (SoA: xyz + intensity)
     size_t n_points = header->point_count;
-    result.points_data.reserve(n_points * 4);  // x, y, z, intensity
-    result.xyz_data.reserve(n_points * 3);     // x, y, z only
+    result.xyz_data.resize(n_points * 3);
+    result.intensity_data.resize(n_points);
 
     // Zero-copy point parsing
     const Point* points = reinterpret_cast<const Point*>(data + HEADER_SIZE);
+    float* xyz = result.xyz_data.data();
+    uint8_t* intensity = result.intensity_data.data();
 
     for (size_t i = 0; i < n_points; i++) {
         const Point& pt = points[i];
-
-        // points array: (N, 4)
-        result.points_data.push_back(pt.x);
-        result.points_data.push_back(pt.y);
-        result.points_data.push_back(pt.z);
-        result.points_data.push_back(static_cast<float>(pt.intensity));
-
-        // xyz array: (N, 3)
-        result.xyz_data.push_back(pt.x);
-        result.xyz_data.push_back(pt.y);
-        result.xyz_data.push_back(pt.z);
+        xyz[i * 3 + 0] = pt.x;
+        xyz[i * 3 + 1] = pt.y;
+        xyz[i * 3 + 2] = pt.z;
+        intensity[i] = pt.intensity;
     }
 
     stats_.valid_packets++;
@@ -5,8 +5,19 @@
 
 namespace py = pybind11;
 
+// Helper: Move a vector into a NumPy array without copying; the capsule owns
+// the heap-allocated vector and frees it when the array is collected
+template <typename T>
+py::array_t<T> vector_to_array(std::vector<T>&& data, std::vector<py::ssize_t> shape) {
+    auto* owner = new std::vector<T>(std::move(data));
+    py::capsule capsule(owner, [](void* p) {
+        delete static_cast<std::vector<T>*>(p);
+    });
+    return py::array_t<T>(shape, owner->data(), capsule);
+}
+
 // Helper: Convert ParsedPacket to Python dict (matching Python API)
-py::object packet_to_dict(const ParsedPacket& packet) {
+py::object packet_to_dict(ParsedPacket&& packet) {
     py::dict result;
 
     result["device_ts_ns"] = packet.device_ts_ns;
@@ -16,47 +27,10 @@ py::object packet_to_dict(const ParsedPacket& packet) {
     result["flags"] = packet.flags;
     result["crc32"] = packet.crc32;
 
-    // Create NumPy arrays with zero-copy (data ownership transferred to Python)
-    size_t n_points = packet.point_count;
-
-    // points: (N, 4) array
-    auto* points_data = new float[n_points * 4];
-    std::memcpy(points_data, packet.points_data.data(), n_points * 4 * sizeof(float));
-
-    py::capsule points_capsule(points_data, [](void* p) {
-        delete[] static_cast<float*>(p);
-    });
-
-    std::vector<py::ssize_t> points_shape = {static_cast<py::ssize_t>(n_points), 4};
-    std::vector<py::ssize_t> points_strides = {4 * sizeof(float), sizeof(float)};
-
-    py::array_t<float> points(
-        points_shape,
-        points_strides,
-        points_data,
-        points_capsule
-    );
-
-    // xyz: (N, 3) array
-    auto* xyz_data = new float[n_points * 3];
-    std::memcpy(xyz_data, packet.xyz_data.data(), n_points * 3 * sizeof(float));
-
-    py::capsule xyz_capsule(xyz_data, [](void* p) {
-        delete[] static_cast<float*>(p);
-    });
-
-    std::vector<py::ssize_t> xyz_shape = {static_cast<py::ssize_t>(n_points), 3};
-    std::vector<py::ssize_t> xyz_strides = {3 * sizeof(float), sizeof(float)};
-
-    py::array_t<float> xyz(
-        xyz_shape,
-        xyz_strides,
-        xyz_data,
-        xyz_capsule
-    );
-
-    result["points"] = points;
-    result["xyz"] = xyz;
+    // SoA arrays, ownership transferred to Python (zero-copy)
+    const auto n_points = static_cast<py::ssize_t>(packet.point_count);
+    result["xyz"] = vector_to_array(std::move(packet.xyz_data), {n_points, 3});
+    result["intensity"] = vector_to_array(std::move(packet.intensity_data), {n_points});
 
     return result;
 }
@@ -67,19 +41,18 @@ public:
     explicit LidarProtocolPy(bool validate_crc = true, py::object stats = py::none())
         : protocol_(validate_crc), external_stats_(stats) {}
 
-    // Parse datagram (accepts Python bytes)
-    py::object parse_datagram(py::bytes data, bool debug = false) {
-        // Extract raw bytes from Python bytes object
-        char* buffer;
-        ssize_t length;
-        if (PYBIND11_BYTES_AS_STRING_AND_SIZE(data.ptr(), &buffer, &length) == -1) {
-            throw std::runtime_error("Failed to extract bytes");
+    // Parse datagram (accepts bytes, bytearray, memoryview, ...)
+    py::object parse_datagram(py::buffer data, bool debug = false) {
+        // Borrow the raw bytes via the buffer protocol (no copy)
+        py::buffer_info info = data.request();
+        if (info.ndim != 1 || info.itemsize != 1 || info.strides[0] != 1) {
+            throw std::runtime_error("datagram must be a contiguous byte buffer");
         }
 
         // Call C++ parser
         auto result = protocol_.parse_datagram(
-            reinterpret_cast<const uint8_t*>(buffer),
-            static_cast<size_t>(length),
+            static_cast<const uint8_t*>(info.ptr),
+            static_cast<size_t>(info.size),
             debug
         );
 
@@ -94,7 +67,7 @@ public:
         }
 
         // Convert to Python dict
-        return packet_to_dict(*result);
+        return packet_to_dict(std::move(*result));
     }
 
     // CRC32 calculation (for testing/debugging)
@@ -169,7 +142,7 @@ PYBIND11_MODULE(lidar_protocol_cpp, m) {
              py::arg("debug") = false,
              "Parse a single UDP datagram\n\n"
              "Args:\n"
-             "    datagram (bytes): Raw UDP packet bytes\n"
+             "    datagram (bytes-like): Raw UDP packet (bytes, bytearray, memoryview)\n"
              "    debug (bool): Enable debug logging\n\n"
              "Returns:\n"
              "    dict or None: Parsed packet data or None if invalid\n"
@@ -180,8 +153,8 @@ PYBIND11_MODULE(lidar_protocol_cpp, m) {
              "            'sensor_id': int,\n"
              "            'flags': int,\n"
              "            'crc32': int,\n"
-             "            'points': np.ndarray (N, 4) [x, y, z, intensity],\n"
-             "            'xyz': np.ndarray (N, 3) [x, y, z only]\n"
+             "            'xyz': np.ndarray (N, 3) float32 [x, y, z],\n"
+             "            'intensity': np.ndarray (N,) uint8\n"
              "        }")
         .def("crc32_ieee802_3", &LidarProtocolPy::crc32_ieee802_3,
              py::arg("data"),
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Phase 1/2 Hot-Path Benchmark (C++ backend)
+
+Feeds synthetic LiDAR packets through the C++ protocol parser (Phase 1)
+and frame builder (Phase 2) and reports μs/packet for each. Used as the
+training workload for `./build.sh pgo`, and to compare builds before/after.
+
+Usage:
+    python3 profile_phase2.py [--packets 20000] [--batch-size 20]
+"""
+
+import argparse
+import struct
+import time
+import zlib
+import numpy as np
+
+from lidar_protocol_cpp import LidarProtocol  # type: ignore
+from frame_builder_cpp import FrameBuilder  # type: ignore
+
+
+def make_packets(count: int, points_per_packet: int = 96, pps: int = 2000):
+    """Build valid v1 datagrams (with CRC) at a fixed device packet rate"""
+    packets = []
+    period_ns = 1_000_000_000 // pps
+    for seq in range(count):
+        payload = np.zeros(points_per_packet, dtype=[('x', '<f4'), ('y', '<f4'),
+                                                    ('z', '<f4'), ('intensity', 'u1')])
+        xyz = np.random.uniform(-10.0, 10.0, (points_per_packet, 3)).astype(np.float32)
+        payload['x'], payload['y'], payload['z'] = xyz[:, 0], xyz[:, 1], xyz[:, 2]
+        payload['intensity'] = np.random.randint(0, 256, points_per_packet)
+        payload = payload.tobytes()
+
+        header = struct.pack('<IBQIHHH', 0x4C495652, 1, seq * period_ns, seq,
+                             points_per_packet, 0, 0)
+        crc = zlib.crc32(header + payload) & 0xFFFFFFFF
+        packets.append(header + struct.pack('<I', crc) + payload)
+    return packets
+
+
+def run(packets, batch_size: int):
+    """Time Phase 1 and Phase 2 separately, return μs/packet for each"""
+    protocol = LidarProtocol(validate_crc=True)
+
+    t0 = time.perf_counter()
+    parsed = [protocol.parse_datagram(p) for p in packets]
+    t1 = time.perf_counter()
+
+    builder = FrameBuilder(frame_period_s=0.1, max_frame_points=120000)
+    t2 = time.perf_counter()
+    for p in parsed:
+        builder.add_packet(p['device_ts_ns'], p['xyz'], p['seq'])
+    t3 = time.perf_counter()
+
+    builder = FrameBuilder(frame_period_s=0.1, max_frame_points=120000)
+    t4 = time.perf_counter()
+    for i in range(0, len(parsed), batch_size):
+        chunk = parsed[i:i + batch_size]
+        builder.add_packets_batch([p['device_ts_ns'] for p in chunk],
+                                  [p['xyz'] for p in chunk],
+                                  [p['seq'] for p in chunk])
+    t5 = time.perf_counter()
+
+    n = len(packets)
+    return ((t1 - t0) / n * 1e6, (t3 - t2) / n * 1e6, (t5 - t4) / n * 1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Phase 1/2 C++ hot-path benchmark")
+    parser.add_argument('--packets', type=int, default=20000,
+                        help='Number of synthetic packets')
+    parser.add_argument('--batch-size', type=int, default=20,
+                        help='Packets per add_packets_batch call')
+    args = parser.parse_args()
+
+    packets = make_packets(args.packets)
+    phase1_us, phase2_us, phase2_batch_us = run(packets, args.batch_size)
+
+    print("=" * 50)
+    print(f"Packets:               {args.packets}")
+    print(f"Phase 1 (protocol):    {phase1_us:.3f} μs/packet")
+    print(f"Phase 2 (add_packet):  {phase2_us:.3f} μs/packet")
+    print(f"Phase 2 (batch={args.batch_size:<3d}):   {phase2_batch_us:.3f} μs/packet")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
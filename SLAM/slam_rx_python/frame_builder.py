@@ -13,6 +13,9 @@ from dataclasses import dataclass
 @dataclass
 class Frame:
     """Point cloud frame with metadata"""
+    __slots__ = ('xyz', 'start_ts_ns', 'end_ts_ns', 'seq_first', 'seq_last',
+                 'pkt_count', 'point_count')
+
     xyz: np.ndarray          # (N, 3) coordinates in meters
     start_ts_ns: int         # Frame start timestamp (ns)
     end_ts_ns: int           # Frame end timestamp (ns)
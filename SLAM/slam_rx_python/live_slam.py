@@ -21,15 +21,17 @@ Examples:
 
 import socket
 import argparse
+import os
+import logging
 import signal
 import sys
+import threading
 import time
-import math
-import struct
 from pathlib import Path
 import json
 import numpy as np
 from datetime import datetime
+from collections import deque
 
 try:
     import zmq
@@ -43,10 +45,27 @@ from lidar_protocol import LidarProtocol, ProtocolStats
 from frame_builder import FrameBuilder, FrameBuilderStats
 from slam_pipeline import SlamPipeline, SlamStats
 
+# G1PC stream header '<4sBId16fI' (85 bytes), filled in place per frame
+G1PC_HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('version', 'u1'),
+    ('frame_id', '<u4'),
+    ('t_sec', '<f8'),
+    ('pose', '<f4', (16,)),
+    ('count', '<u4'),
+])
+
 
 class LiveSlam:
     """Main SLAM application"""
 
+    # Configuration constants
+    SOCKET_TIMEOUT_S = 0.1
+    UDP_BUFFER_SIZE = 2048
+    UDP_RCVBUF_BYTES = 4 << 20
+    RX_QUEUE_LEN = 4096
+    TRAJ_JOURNAL_ROWS = 1 << 20  # Sparse file; ~72 h at 4 Hz before growing
+
     def __init__(self, args):
         self.args = args
         self.running = True
@@ -58,7 +77,7 @@ class LiveSlam:
 
         # Components
         self.protocol = LidarProtocol(
-            validate_crc=True,
+            validate_crc=not args.no_crc,
             stats=self.protocol_stats
         )
 
@@ -82,15 +101,32 @@ class LiveSlam:
         # UDP socket
         self.sock = None
 
+        # Receiver thread (--rx-thread): socket -> rx_queue -> main loop
+        self.rx_thread = None
+        self.rx_queue = deque(maxlen=self.RX_QUEUE_LEN)
+        self.rx_ready = threading.Event()
+        self.rx_dropped = 0
+
         # Logging
-        self.last_log_time = time.time()
+        self.last_log_time = time.monotonic()
         self.log_interval = 1.0  # seconds
-
-        # Pose drift tracking (for stationary test)
-        self.pose_history = []
-
-        # Trajectory: list of (t[sec], 4x4 pose)
-        self.traj_records = []
+        self._next_log_t = self.last_log_time + self.log_interval
+
+        # Trajectory (also the pose history for drift analysis): row =
+        # [t_sec, 4x4 pose row-major], filled by index and doubled when full
+        self._traj_buf = np.empty((1024, 17), dtype=np.float64)
+        self._traj_n = 0
+        self._traj_journal = None
+        if args.traj_journal:
+            # Back the buffer with a memory-mapped .npy so recorded poses
+            # survive a crash (the page cache writes them out)
+            base_dir = Path(args.output_dir).expanduser()
+            base_dir.mkdir(parents=True, exist_ok=True)
+            self._traj_journal = base_dir / f"trajectory_journal_{datetime.now():%Y%m%d_%H%M%S}.npy"
+            self._traj_buf = np.lib.format.open_memmap(
+                self._traj_journal, mode='w+', dtype=np.float64,
+                shape=(self.TRAJ_JOURNAL_ROWS, 17))
+            print(f"[TRJ] Journaling poses to {self._traj_journal}")
         self.start_wall_time = time.time()
 
         # ZMQ Streaming
@@ -98,10 +134,17 @@ class LiveSlam:
         self.stream_port = args.stream_port
         self.stream_voxel = args.stream_voxel
         self.stream_max_points = args.stream_max_points
+        self.stream_bev = args.stream_bev
+        self.stream_period = 1.0 / args.stream_rate if args.stream_rate > 0 else 0.0
+        self._stream_has_sub = False
+        self._last_stream_t = float('-inf')
         self.frame_id = 0
         self.frame_count = 0  # Frame counter for streaming
         self.zctx = None
         self.pub = None
+        self._hdr = np.zeros(1, dtype=G1PC_HEADER_DTYPE)
+        self._hdr['magic'] = b'G1PC'
+        self._hdr['version'] = 1
 
         # ========== Warmup for SLAM initialization ==========
         # DISABLED - Not needed with proper coordinate transform
@@ -111,66 +154,118 @@ class LiveSlam:
 
         if self.stream_enabled:
             self.zctx = zmq.Context.instance()
-            self.pub = self.zctx.socket(zmq.PUB)
+            # XPUB reports (un)subscriptions so map extraction can be skipped
+            # while no viewer is connected
+            self.pub = self.zctx.socket(zmq.XPUB)
+            # Map frames supersede each other: keep at most 2 queued per
+            # subscriber (PUB drops beyond HWM) and never block on close.
+            # CONFLATE would be the ideal policy but does not support the
+            # multipart frames used below.
+            self.pub.setsockopt(zmq.SNDHWM, 2)
+            self.pub.setsockopt(zmq.LINGER, 0)
+            self.pub.setsockopt(zmq.SNDBUF, 4 << 20)
             self.pub.bind(f"tcp://0.0.0.0:{self.stream_port}")
-            print(f"[STREAM] ZMQ PUB bound to tcp://0.0.0.0:{self.stream_port}")
+            print(f"[STREAM] ZMQ XPUB bound to tcp://0.0.0.0:{self.stream_port}")
 
     @staticmethod
-    def _rot_to_quat(R: np.ndarray):
-        """Rotation matrix(3x3) -> quaternion (qx, qy, qz, qw)"""
-        m00, m01, m02 = R[0,0], R[0,1], R[0,2]
-        m10, m11, m12 = R[1,0], R[1,1], R[1,2]
-        m20, m21, m22 = R[2,0], R[2,1], R[2,2]
+    def _rot_to_quat(R: np.ndarray) -> np.ndarray:
+        """
+        Rotation matrices (N, 3, 3) -> quaternions (N, 4) as (qx, qy, qz, qw)
+
+        Vectorized over all poses: the four branches of the usual
+        trace/largest-diagonal method are selected per row with masks.
+        """
+        m00, m01, m02 = R[:, 0, 0], R[:, 0, 1], R[:, 0, 2]
+        m10, m11, m12 = R[:, 1, 0], R[:, 1, 1], R[:, 1, 2]
+        m20, m21, m22 = R[:, 2, 0], R[:, 2, 1], R[:, 2, 2]
         tr = m00 + m11 + m22
-        if tr > 0:
-            S = math.sqrt(tr + 1.0) * 2
-            qw = 0.25 * S
-            qx = (m21 - m12) / S
-            qy = (m02 - m20) / S
-            qz = (m10 - m01) / S
-        elif (m00 > m11) and (m00 > m22):
-            S = math.sqrt(1.0 + m00 - m11 - m22) * 2
-            qw = (m21 - m12) / S
-            qx = 0.25 * S
-            qy = (m01 + m10) / S
-            qz = (m02 + m20) / S
-        elif m11 > m22:
-            S = math.sqrt(1.0 + m11 - m00 - m22) * 2
-            qw = (m02 - m20) / S
-            qx = (m01 + m10) / S
-            qy = 0.25 * S
-            qz = (m12 + m21) / S
-        else:
-            S = math.sqrt(1.0 + m22 - m00 - m11) * 2
-            qw = (m10 - m01) / S
-            qx = (m02 + m20) / S
-            qy = (m12 + m21) / S
-            qz = 0.25 * S
-        return (qx, qy, qz, qw)
+
+        c0 = tr > 0
+        c1 = ~c0 & (m00 > m11) & (m00 > m22)
+        c2 = ~c0 & ~c1 & (m11 > m22)
+        cases = [c0, c1, c2]  # default: m22 is the largest diagonal
+
+        # One S per row, from the selected branch only (never zero there)
+        S = np.sqrt(1.0 + np.select(cases, [tr, m00 - m11 - m22, m11 - m00 - m22],
+                                    m22 - m00 - m11)) * 2
+        quarter = 0.25 * S
+        a = (m21 - m12) / S
+        b = (m02 - m20) / S
+        c = (m10 - m01) / S
+        d = (m01 + m10) / S
+        e = (m02 + m20) / S
+        f = (m12 + m21) / S
+
+        qx = np.select(cases, [a, quarter, d], e)
+        qy = np.select(cases, [b, d, quarter], f)
+        qz = np.select(cases, [c, e, f], quarter)
+        qw = np.select(cases, [quarter, a, b], c)
+        return np.column_stack((qx, qy, qz, qw))
+
+    def _record_trajectory(self, t_sec: float, pose: np.ndarray):
+        """Append one (t, 4x4 pose) row to the trajectory buffer"""
+        if self._traj_n == len(self._traj_buf):
+            shape = (2 * len(self._traj_buf), 17)
+            if self._traj_journal is not None:
+                tmp = self._traj_journal.with_suffix('.grow.npy')
+                grown = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float64, shape=shape)
+                grown[:self._traj_n] = self._traj_buf
+                grown.flush()
+                tmp.replace(self._traj_journal)
+            else:
+                grown = np.empty(shape, dtype=np.float64)
+                grown[:self._traj_n] = self._traj_buf
+            self._traj_buf = grown
+        row = self._traj_buf[self._traj_n]
+        row[0] = t_sec
+        row[1:] = pose.ravel()
+        self._traj_n += 1
+
+    @property
+    def pose_history(self) -> np.ndarray:
+        """Recorded poses (N, 4, 4), a view into the trajectory buffer"""
+        n = self._traj_n
+        return self._traj_buf[:n, 1:].reshape(n, 4, 4)
 
     def _save_trajectory(self, prefix: str):
         """Save trajectory to .csv (TUM) and .npy"""
-        if not self.traj_records:
+        n = self._traj_n
+        if n == 0:
             print("[TRJ] No trajectory to save")
             return
-        rows = []
-        for t, pose in self.traj_records:
-            R = pose[:3, :3]
-            tx, ty, tz = pose[:3, 3]
-            qx, qy, qz, qw = self._rot_to_quat(R)
-            rows.append([t, tx, ty, tz, qx, qy, qz, qw])
-        arr = np.asarray(rows, dtype=np.float64)
+        t = self._traj_buf[:n, 0]
+        poses = self.pose_history
+        arr = np.column_stack((t, poses[:, :3, 3], self._rot_to_quat(poses[:, :3, :3])))
         csv_path = f"{prefix}.csv"
         npy_path = f"{prefix}.npy"
-        np.savetxt(csv_path, arr, fmt="%.9f", delimiter=" ")
+        # One formatting pass over the whole table (same output as np.savetxt, no per-row loop)
+        row_fmt = " ".join(["%.9f"] * arr.shape[1]) + "\n"
+        with open(csv_path, "w") as f:
+            f.write((row_fmt * len(arr)) % tuple(arr.ravel().tolist()))
         np.save(npy_path, arr)
         print(f"[TRJ] Trajectory saved: {csv_path}  ({len(arr)} poses)")
         print(f"[TRJ] Numpy backup   : {npy_path}")
 
     def _ds_for_stream(self, xyz: np.ndarray) -> np.ndarray:
-        """Downsample points for streaming"""
+        """Downsample points for streaming (voxel grid or 2D BEV, then size cap)"""
         pts = xyz
-        # Simple cap - can add voxel downsampling if needed
+        if self.stream_bev and self.stream_voxel > 0 and len(pts) > 0:
+            # One point per (x, y) cell at the cell centre, z = mean height
+            res = self.stream_voxel
+            ij = np.floor(pts[:, :2] * (1.0 / res)).astype(np.int64)
+            keys = (ij[:, 0] << 32) | (ij[:, 1] & 0xFFFFFFFF)
+            cells, inv, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            bev = np.empty((len(cells), 3), dtype=np.float32)
+            bev[:, 0] = ((cells >> 32) + 0.5) * res
+            bev[:, 1] = (cells.astype(np.int32) + 0.5) * res  # Low 32 bits, signed
+            bev[:, 2] = np.bincount(inv.ravel(), weights=pts[:, 2]) / counts
+            pts = bev
+        elif self.stream_voxel > 0 and len(pts) > 0:
+            # One point per voxel: pack 21-bit cell indices into one int64 key
+            k = np.floor(pts * (1.0 / self.stream_voxel)).astype(np.int64)
+            keys = (k[:, 0] & 0x1FFFFF) | ((k[:, 1] & 0x1FFFFF) << 21) | ((k[:, 2] & 0x1FFFFF) << 42)
+            _, idx = np.unique(keys, return_index=True)
+            pts = pts[idx]
         if len(pts) > self.stream_max_points:
             idx = np.linspace(0, len(pts)-1, self.stream_max_points, dtype=np.int32)
             pts = pts[idx]
@@ -178,6 +273,7 @@ class LiveSlam:
 
     def _get_map_points(self):
         """Extract current SLAM map points"""
+        debug_tick = self.args.debug and self.frame_count % 50 == 0
         try:
             # Get map from KISS-ICP
             if hasattr(self.slam_pipeline.odometry, 'local_map'):
@@ -186,12 +282,12 @@ class LiveSlam:
                 if hasattr(local_map, 'point_cloud'):
                     pts = local_map.point_cloud()
                     # ========== DEBUG: Map size ==========
-                    if self.args.debug and self.frame_count % 50 == 0:
+                    if debug_tick:
                         print(f"🗺️  [MAP] Extracted {len(pts)} points from SLAM map")
                     # =====================================
                     return pts
             # ========== WARNING: No map found ==========
-            if self.args.debug and self.frame_count % 50 == 0:
+            if debug_tick:
                 print("⚠️  [MAP] No local_map attribute found!")
             # ===========================================
             return None
@@ -206,13 +302,26 @@ class LiveSlam:
         """Send frame via ZMQ (G1PC protocol) - sends SLAM MAP, not raw scan"""
         if not self.stream_enabled:
             return
+        debug_tick = self.args.debug and self.slam_stats.frames_processed % 50 == 0
 
         try:
+            # Viewer presence: XPUB yields b'\x01' on first subscribe, b'\x00' when the last one leaves
+            while True:
+                try:
+                    event = self.pub.recv(zmq.NOBLOCK)
+                except zmq.Again:
+                    break
+                if event:
+                    self._stream_has_sub = event[0] == 1
+            if not self._stream_has_sub or (t_sec - self._last_stream_t) < self.stream_period:
+                return
+            self._last_stream_t = t_sec
+
             # Get current SLAM map points (world coordinates)
             map_pts = self._get_map_points()
             if map_pts is None or len(map_pts) == 0:
                 # ========== WARNING: Empty map ==========
-                if self.args.debug and self.slam_stats.frames_processed % 50 == 0:
+                if debug_tick:
                     print(f"⚠️  [STREAM] Empty map at frame #{self.slam_stats.frames_processed}")
                 # ========================================
                 return
@@ -221,24 +330,23 @@ class LiveSlam:
             pts = self._ds_for_stream(map_pts)
 
             # ========== DEBUG: Streaming confirmation ==========
-            if self.args.debug and self.slam_stats.frames_processed % 50 == 0:
+            if debug_tick:
                 print(f"📡 [STREAM] Sending {len(pts)} points (frame #{self.slam_stats.frames_processed})")
             # ===================================================
 
-            magic = b'G1PC'
-            version = 1
-            frame_id = self.frame_id
+            # Header: '<4sBId16fI' (magic/version preset in __init__)
+            hdr = self._hdr
+            hdr['frame_id'] = self.frame_id
+            hdr['t_sec'] = t_sec
+            hdr['pose'] = pose4x4.reshape(-1)
+            hdr['count'] = len(pts)
             self.frame_id += 1
-            pose = pose4x4.astype(np.float32).reshape(-1)
-            count = np.uint32(len(pts))
-
-            # Header: '<4sBId16fI'
-            header = struct.pack('<4sBId16fI',
-                                magic, version, frame_id, float(t_sec),
-                                *pose, int(count))
 
-            # Send header + payload
-            self.pub.send(header + pts.tobytes(order='C'), zmq.NOBLOCK)
+            # Send header and payload as two frames. The header record is
+            # reused, so it is copied; the payload is handed to libzmq
+            # zero-copy (the frame keeps `pts` alive until sent).
+            self.pub.send(hdr.data, zmq.SNDMORE | zmq.NOBLOCK)
+            self.pub.send(np.ascontiguousarray(pts), zmq.NOBLOCK, copy=False)
         except Exception as e:
             if self.args.debug:
                 print(f"[STREAM] Send error: {e}")
@@ -247,10 +355,76 @@ class LiveSlam:
         """Create and configure UDP socket"""
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.bind((self.args.listen_ip, self.args.listen_port))
-        self.sock.settimeout(0.1)  # 100ms timeout for clean shutdown
+        self.sock.settimeout(self.SOCKET_TIMEOUT_S)  # Short timeout for clean shutdown
+
+        # Reused receive buffer for the direct (non --rx-thread) path
+        self._rx_buf = bytearray(self.UDP_BUFFER_SIZE)
+        self._rx_view = memoryview(self._rx_buf)
+
+        # Headroom for bursts while the SLAM thread is busy in ICP
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.UDP_RCVBUF_BYTES)
 
         print(f"✓ UDP socket listening on {self.args.listen_ip}:{self.args.listen_port}")
 
+        if self.args.rx_thread:
+            self.rx_thread = threading.Thread(target=self._rx_loop, name="udp-rx", daemon=True)
+            self.rx_thread.start()
+            print(f"✓ Receiver thread enabled (queue={self.RX_QUEUE_LEN} datagrams)")
+
+    def _apply_scheduling(self):
+        """Optional CPU pinning / SCHED_FIFO for the SLAM thread (Linux; later threads inherit)
+
+        SCHED_FIFO needs CAP_SYS_NICE, e.g. `sudo setcap cap_sys_nice+ep $(which python3)`
+        or `docker run --cap-add=SYS_NICE`. Failures are reported, not fatal.
+        """
+        if self.args.cpu_affinity:
+            cpus = {int(c) for c in self.args.cpu_affinity.split(',')}
+            try:
+                os.sched_setaffinity(0, cpus)
+                print(f"✓ CPU affinity: {sorted(cpus)}")
+            except (AttributeError, OSError) as e:
+                print(f"⚠ Could not set CPU affinity {sorted(cpus)}: {e}")
+        if self.args.rt_priority > 0:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.args.rt_priority))
+                print(f"✓ SCHED_FIFO priority {self.args.rt_priority}")
+            except (AttributeError, OSError) as e:
+                print(f"⚠ Could not set SCHED_FIFO (needs CAP_SYS_NICE): {e}")
+
+    def _rx_loop(self):
+        """Receiver thread: drain the UDP socket into rx_queue (oldest dropped when full)"""
+        sock = self.sock
+        rx_queue = self.rx_queue
+        rx_ready = self.rx_ready
+        if self.args.rx_cpu >= 0:
+            try:
+                os.sched_setaffinity(0, {self.args.rx_cpu})  # pid 0 = this thread on Linux
+            except (AttributeError, OSError) as e:
+                print(f"⚠ Could not pin receiver thread to CPU {self.args.rx_cpu}: {e}")
+        while self.running:
+            try:
+                data = sock.recv(self.UDP_BUFFER_SIZE)
+            except socket.timeout:
+                continue
+            except OSError:
+                break  # Socket closed during shutdown
+            if len(rx_queue) == self.RX_QUEUE_LEN:
+                self.rx_dropped += 1
+            rx_queue.append(data)
+            rx_ready.set()
+
+    def _recv_queued(self) -> bytes:
+        """Pop the next datagram from the receiver thread (raises socket.timeout when idle)"""
+        rx_queue = self.rx_queue
+        while True:
+            if rx_queue:
+                return rx_queue.popleft()
+            self.rx_ready.clear()
+            if rx_queue:
+                continue  # Appended between the check and clear()
+            if not self.rx_ready.wait(self.SOCKET_TIMEOUT_S):
+                raise socket.timeout()
+
     def signal_handler(self, signum, frame):
         """Handle Ctrl+C gracefully"""
         print("\n\n⚠ Shutdown signal received...")
@@ -258,12 +432,13 @@ class LiveSlam:
 
     def log_stats(self, force=False):
         """Print periodic statistics"""
-        now = time.time()
-        if not force and (now - self.last_log_time) < self.log_interval:
+        now = time.monotonic()
+        if now < self._next_log_t and not force:
             return
 
         elapsed = now - self.last_log_time
         self.last_log_time = now
+        self._next_log_t = now + self.log_interval
 
         # Calculate rates
         pps = self.protocol_stats.total_packets / max(elapsed, 0.001)
@@ -310,7 +485,7 @@ class LiveSlam:
         if len(self.pose_history) < 2:
             return
 
-        positions = np.array([p[:3, 3] for p in self.pose_history])
+        positions = self.pose_history[:, :3, 3]
         deltas = np.diff(positions, axis=0)
         distances = np.linalg.norm(deltas, axis=1)
 
@@ -354,6 +529,7 @@ class LiveSlam:
         print()
 
         # Setup
+        self._apply_scheduling()
         self.setup_socket()
 
         # Signal handler
@@ -362,25 +538,37 @@ class LiveSlam:
 
         print("Listening for LiDAR packets... (Ctrl+C to stop)\n")
 
+        # Per-packet names bound once (attribute lookups add up at 500+ pps)
+        debug = self.args.debug
+        recv_queued = self._recv_queued if self.rx_thread is not None else None
+        recv_into = self.sock.recv_into
+        rx_buf = self._rx_buf
+        rx_view = self._rx_view
+        parse_datagram = self.protocol.parse_datagram
+        add_packet = self.frame_builder.add_packet
+        log_stats = self.log_stats
+
         try:
             while self.running:
                 try:
                     # Receive UDP packet
-                    data, addr = self.sock.recvfrom(2048)
+                    if recv_queued is not None:
+                        data = recv_queued()
+                    else:
+                        # In place, no per-packet bytes; the zero-copy views below
+                        # alias _rx_buf and are consumed (copied by FrameBuilder)
+                        # before the next receive
+                        data = rx_view[:recv_into(rx_buf)]
 
                     # Parse packet
-                    packet = self.protocol.parse_datagram(data, debug=self.args.debug)
+                    # zero_copy: FrameBuilder copies xyz anyway, so skip the parser's copy
+                    packet = parse_datagram(data, debug, True)
 
                     if packet is None:
                         continue  # Invalid packet
 
                     # Add to frame builder
-                    frame = self.frame_builder.add_packet(
-                        device_ts_ns=packet['device_ts_ns'],
-                        points_xyz=packet['xyz'],
-                        seq=packet['seq'],
-                        debug=self.args.debug
-                    )
+                    frame = add_packet(packet['device_ts_ns'], packet['xyz'], packet['seq'], debug)
 
                     # Process complete frame
                     if frame is not None:
@@ -392,27 +580,25 @@ class LiveSlam:
                             continue
                         # =================================================
 
-                        result = self.slam_pipeline.register_frame(frame, debug=self.args.debug)
+                        result = self.slam_pipeline.register_frame(frame, debug=debug)
 
                         if result is not None:
                             # Increment frame counter for streaming
                             self.frame_count += 1
-                            # Track pose for drift analysis
-                            self.pose_history.append(result['pose'].copy())
                             # Trajectory record (wall-clock relative time)
                             t_sec = time.time() - self.start_wall_time
-                            self.traj_records.append((t_sec, result['pose'].copy()))
+                            self._record_trajectory(t_sec, result['pose'])
                             # Stream SLAM map to remote viewer
                             self._send_frame(result['pose'], t_sec)
 
                     # Periodic logging
-                    self.log_stats()
+                    log_stats()
 
                 except socket.timeout:
                     continue  # Normal timeout, check self.running
                 except Exception as e:
                     print(f"❌ Error processing packet: {e}")
-                    if self.args.debug:
+                    if debug:
                         import traceback
                         traceback.print_exc()
 
@@ -434,7 +620,13 @@ class LiveSlam:
         if final_frame:
             result = self.slam_pipeline.register_frame(final_frame, debug=self.args.debug)
             if result:
-                self.pose_history.append(result['pose'].copy())
+                self._record_trajectory(time.time() - self.start_wall_time, result['pose'])
+
+        # Stop receiver thread (exits within one socket timeout)
+        if self.rx_thread is not None:
+            self.rx_thread.join(timeout=1.0)
+            if self.rx_dropped:
+                print(f"⚠ Receiver queue overflowed: {self.rx_dropped} datagrams dropped")
 
         # Close sockets
         if self.sock:
@@ -499,6 +691,12 @@ class LiveSlam:
                 except Exception as e:
                     print(f"[OUT] latest symlink skipped: {e}")
 
+        # Trajectory is saved; the crash-recovery journal is no longer needed
+        if self._traj_journal is not None:
+            self._traj_buf.flush()
+            self._traj_buf = np.array(self._traj_buf[:self._traj_n])
+            self._traj_journal.unlink(missing_ok=True)
+
         print("\n✓ Shutdown complete\n")
 
 
@@ -514,6 +712,18 @@ def parse_args():
                         help='UDP listen IP address')
     parser.add_argument('--listen-port', type=int, default=9999,
                         help='UDP listen port')
+    parser.add_argument('--rx-thread', action='store_true',
+                        help='Receive UDP on a background thread so SLAM stalls do not block the socket')
+    parser.add_argument('--no-crc', action='store_true',
+                        help='Skip per-packet CRC32 validation (trusted point-to-point link only)')
+
+    # Scheduling (Linux)
+    parser.add_argument('--cpu-affinity', type=str, default=None,
+                        help='Comma-separated CPUs to pin the process to (e.g. 2,3)')
+    parser.add_argument('--rt-priority', type=int, default=0,
+                        help='SCHED_FIFO priority 1-99 (0 = normal scheduling, needs CAP_SYS_NICE)')
+    parser.add_argument('--rx-cpu', type=int, default=-1,
+                        help='CPU for the --rx-thread receiver (-1 = inherit process affinity)')
 
     # Frame building
     parser.add_argument('--frame-rate', type=int, default=4,
@@ -548,6 +758,8 @@ def parse_args():
                         help='Optional run name appended to session folder (e.g., lab-corridor)')
     parser.add_argument('--no-session-folder', action='store_true',
                         help='Save directly under output-dir (no timestamped subfolder)')
+    parser.add_argument('--traj-journal', action='store_true',
+                        help='Journal poses to a memory-mapped .npy in output-dir during the run (crash-safe; removed after a clean save)')
 
     # Streaming
     parser.add_argument('--stream-enable', action='store_true',
@@ -558,6 +770,10 @@ def parse_args():
                         help='Voxel size for stream downsampling (0 = disabled)')
     parser.add_argument('--stream-max-points', type=int, default=60000,
                         help='Max points per streamed frame')
+    parser.add_argument('--stream-rate', type=float, default=2.0,
+                        help='Max map stream rate (Hz, 0 = every SLAM frame)')
+    parser.add_argument('--stream-bev', action='store_true',
+                        help='Stream a 2D height map (one point per --stream-voxel XY cell, z = mean height)')
 
     # Debug
     parser.add_argument('--debug', action='store_true',
@@ -568,5 +784,12 @@ def parse_args():
 
 if __name__ == "__main__":
     args = parse_args()
+
+    if args.debug:
+        # lidar_protocol logs packet rejections through `logging`
+        proto_logger = logging.getLogger("lidar_protocol")
+        proto_logger.setLevel(logging.DEBUG)
+        proto_logger.addHandler(logging.StreamHandler(sys.stdout))
+
     app = LiveSlam(args)
     app.run()
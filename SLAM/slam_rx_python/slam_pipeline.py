@@ -4,12 +4,47 @@ SLAM Pipeline - KISS-ICP Wrapper
 Wraps KISS-ICP odometry with filtering, coordinate transforms, and statistics.
 """
 
+import math
 import numpy as np
 from typing import Dict, Optional
 from kiss_icp.kiss_icp import KissICP
 from kiss_icp.config import KISSConfig
 from frame_builder import Frame
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _self_filter_kernel(xyz, r2, z_lim, out):
+        """
+        Copy points outside the self-filter cylinder into `out` (one pass)
+
+        Args:
+            xyz: Input points (N, 3)
+            r2: Squared XY radius of the cylinder
+            z_lim: Cylinder half-height (symmetric ±)
+            out: Output (>= N, 3) array, same dtype as xyz
+
+        Returns:
+            Number of points written to out
+        """
+        m = 0
+        for i in range(xyz.shape[0]):
+            x = xyz[i, 0]
+            y = xyz[i, 1]
+            z = xyz[i, 2]
+            if x * x + y * y >= r2 or abs(z) >= z_lim:
+                out[m, 0] = x
+                out[m, 1] = y
+                out[m, 2] = z
+                m += 1
+        return m
+
 
 class SlamStats:
     """SLAM processing statistics"""
@@ -43,6 +78,23 @@ class SlamPipeline:
         [ 0,  0, -1,  0],  # Flip Z
         [ 0,  0,  0,  1]
     ], dtype=np.float64)
+    # _R_MOUNT is diag(1, -1, -1, 1), so applying it is a sign flip of the Y/Z
+    # rows (pose) or columns (points); _mount_pose/_mount_points do exactly
+    # that instead of a matmul. Change them together if the mount changes.
+
+    @staticmethod
+    def _mount_pose(pose_sensor: np.ndarray) -> np.ndarray:
+        """Sensor-frame 4x4 pose -> robot frame (== _R_MOUNT @ pose), in place"""
+        np.negative(pose_sensor[1:3], out=pose_sensor[1:3])
+        return pose_sensor
+
+    @staticmethod
+    def _mount_points(points_sensor: np.ndarray) -> np.ndarray:
+        """Sensor-frame (N, 3) points -> new float64 robot-frame array (== pts @ _R_MOUNT[:3, :3].T)"""
+        out = np.empty(points_sensor.shape, dtype=np.float64)
+        out[:, 0] = points_sensor[:, 0]
+        np.negative(points_sensor[:, 1:3], out=out[:, 1:3])
+        return out
 
     def __init__(self,
                  max_range: float = 20.0,
@@ -52,7 +104,8 @@ class SlamPipeline:
                  self_filter_z: float = 0.24,
                  min_points_per_frame: int = 800,
                  preset: str = "indoor",
-                 stats: Optional[SlamStats] = None):
+                 stats: Optional[SlamStats] = None,
+                 use_numba: bool = True):
         """
         Initialize SLAM pipeline
 
@@ -65,6 +118,8 @@ class SlamPipeline:
             min_points_per_frame: Skip frames with fewer points (stability)
             preset: Configuration preset ("indoor" or "outdoor")
             stats: Statistics object (creates new if None)
+            use_numba: Run the self-filter as a compiled single-pass kernel
+                when numba is installed (~5x over the NumPy masks at 50k pts)
         """
         self.max_range = max_range
         self.min_range = min_range
@@ -75,11 +130,28 @@ class SlamPipeline:
         self.preset = preset
         self.stats = stats if stats is not None else SlamStats()
 
+        # Robot-frame map memoized per map update (see get_map_in_robot_frame)
+        self._map_version = 0
+        self._map_cache_version = -1
+        self._map_cache = None
+
+        # Self-filter output buffer, reused across frames (grown on demand)
+        self.use_numba = use_numba and NUMBA_AVAILABLE
+        self._filter_out = np.empty((0, 3), dtype=np.float32)
+
+        # Per-point timestamp ramp: index ramp cached, output scaled in place
+        self._ts_idx = np.arange(0, dtype=np.float64)
+        self._ts_out = np.empty(0, dtype=np.float64)
+        if self.use_numba:
+            # Compile (or load from cache) now rather than on the first frame
+            _self_filter_kernel(np.zeros((1, 3), np.float32), 0.0, 0.0,
+                                np.empty((1, 3), np.float32))
+
         # Initialize KISS-ICP
         self._init_kiss_icp()
 
         # Pose tracking
-        self.last_position = np.zeros(3)  # For distance calculation
+        self.last_position = (0.0, 0.0, 0.0)  # (x, y, z) for distance calculation
 
     def _init_kiss_icp(self):
         """Initialize KISS-ICP odometry"""
@@ -125,15 +197,26 @@ class SlamPipeline:
             xyz: Input points (N, 3) in sensor frame
 
         Returns:
-            Filtered points (M, 3)
+            Filtered points (M, 3); with use_numba this is a view into a
+            buffer reused by the next call
         """
         if len(xyz) == 0:
             return xyz
 
+        r2 = self.self_filter_radius * self.self_filter_radius
+
+        if self.use_numba:
+            xyz = np.ascontiguousarray(xyz)
+            if len(self._filter_out) < len(xyz) or self._filter_out.dtype != xyz.dtype:
+                self._filter_out = np.empty((len(xyz), 3), dtype=xyz.dtype)
+            m = _self_filter_kernel(xyz, r2, self.self_filter_z, self._filter_out)
+            return self._filter_out[:m]
+
         # Self-filter: remove points within cylinder around robot
-        # XY plane distance from sensor centerline
-        xy_dist = np.linalg.norm(xyz[:, :2], axis=1)
-        close = xy_dist < self.self_filter_radius
+        # XY plane distance from sensor centerline (squared, no sqrt)
+        x = xyz[:, 0]
+        y = xyz[:, 1]
+        close = x * x + y * y < r2
 
         # Z-axis proximity (symmetric around sensor plane)
         near_plane = np.abs(xyz[:, 2]) < self.self_filter_z
@@ -144,6 +227,22 @@ class SlamPipeline:
         return xyz[mask]
 
 
+    def _timestamps(self, n: int, duration_s: float) -> np.ndarray:
+        """
+        Evenly spaced timestamps 0..duration_s (same values as np.linspace)
+
+        Written into a reused buffer from a cached index ramp, so no array is
+        allocated per frame. The result is overwritten by the next call.
+        """
+        if len(self._ts_idx) < n:
+            self._ts_idx = np.arange(n, dtype=np.float64)
+            self._ts_out = np.empty(n, dtype=np.float64)
+        if n <= 1:
+            return np.zeros(n, dtype=np.float64)
+        ts = np.multiply(self._ts_idx[:n], duration_s / (n - 1), out=self._ts_out[:n])
+        ts[-1] = duration_s  # Exact endpoint, as linspace
+        return ts
+
     def register_frame(self, frame: Frame, debug: bool = False) -> Optional[Dict]:
         """
         Register a frame with KISS-ICP
@@ -167,15 +266,20 @@ class SlamPipeline:
                 'map_points': np.ndarray (Nm, 3) - robot frame
             }
         """
+        # Bind the frame fields used below once
+        xyz = frame.xyz
+        point_count = frame.point_count
+        duration_s = frame.duration_s()
+
         # Check minimum points
-        if frame.point_count < self.min_points_per_frame:
+        if point_count < self.min_points_per_frame:
             self.stats.frames_skipped += 1
             if debug:
-                print(f"[SLAM] ⊘ Frame skipped: {frame.point_count} < {self.min_points_per_frame} points")
+                print(f"[SLAM] ⊘ Frame skipped: {point_count} < {self.min_points_per_frame} points")
             return None
 
         # Apply self-filter (in sensor frame)
-        xyz_filtered = self._filter_points(frame.xyz)
+        xyz_filtered = self._filter_points(xyz)
 
         if len(xyz_filtered) < self.min_points_per_frame:
             self.stats.frames_skipped += 1
@@ -184,24 +288,21 @@ class SlamPipeline:
             return None
 
         # Create timestamp vector (linear interpolation over frame duration)
-        duration_s = frame.duration_s()
-        timestamps = np.linspace(0.0, duration_s, len(xyz_filtered), dtype=np.float64)
+        timestamps = self._timestamps(len(xyz_filtered), duration_s)
 
         # ========== CRITICAL: Feed SENSOR-FRAME points to SLAM ==========
         # KISS-ICP expects raw sensor coordinates. Mount correction is applied
         # to the OUTPUT (map + pose), not the input.
         self.odometry.register_frame(xyz_filtered, timestamps)
+        self._map_version += 1
 
         if debug:
             print(f"[SLAM] Registered {len(xyz_filtered)} pts in sensor frame")
         # ================================================================
 
         # ========== Apply mount correction to SLAM OUTPUT ==========
-        # Get pose in sensor frame
-        pose_sensor = self.odometry.last_pose.copy()
-
-        # Transform to robot frame (4x4 @ 4x4)
-        pose_robot = self._R_MOUNT @ pose_sensor
+        # Get pose in sensor frame, transform the copy to robot frame
+        pose_robot = self._mount_pose(self.odometry.last_pose.copy())
 
         if debug:
             print(f"[SLAM] Pose transformed: sensor→robot frame")
@@ -213,8 +314,11 @@ class SlamPipeline:
         self.stats.last_pose = pose_robot  # Store robot-frame pose
 
         # Calculate distance traveled
-        current_position = pose_robot[:3, 3]
-        delta_dist = np.linalg.norm(current_position - self.last_position)
+        # (plain float math: no temporary array or numpy dispatch for a 3-vector)
+        current_position = x, y, z = pose_robot[:3, 3].tolist()
+        last_x, last_y, last_z = self.last_position
+        dx, dy, dz = x - last_x, y - last_y, z - last_z
+        delta_dist = math.sqrt(dx * dx + dy * dy + dz * dz)
         self.stats.distance_traveled += delta_dist
         self.last_position = current_position
 
@@ -229,17 +333,14 @@ class SlamPipeline:
         map_points = None
         if self.stats.map_points is not None and hasattr(self.stats.map_points, 'point_cloud'):
             try:
-                # Extract map in sensor frame
-                map_sensor = self.stats.map_points.point_cloud()
-                # Transform to robot frame (N,3 @ 3x3.T)
-                map_points = map_sensor @ self._R_MOUNT[:3, :3].T
+                map_points = self.get_map_in_robot_frame()
             except Exception as e:
                 if debug:
                     print(f"[SLAM] ⚠️  Failed to extract map: {e}")
 
         result = {
             'pose': pose_robot,
-            'num_points': frame.point_count,
+            'num_points': point_count,
             'num_points_filtered': len(xyz_filtered),
             'distance_traveled': self.stats.distance_traveled,
             'frame_duration_s': duration_s,
@@ -257,6 +358,33 @@ class SlamPipeline:
 
         return result
 
+    def get_map_in_robot_frame(self) -> Optional[np.ndarray]:
+        """
+        Current map in robot frame, memoized per map update
+
+        The sensor-frame map is extracted and mount-corrected only once per
+        frame registered with KISS-ICP (the VoxelHashMap has no change counter,
+        so register_frame bumps _map_version); repeated calls in between return
+        the same array. Callers share it and must not modify it.
+
+        Returns:
+            Map points (Nm, 3) float64 in robot frame, or None if no map
+        """
+        if self._map_cache_version == self._map_version:
+            return self._map_cache
+
+        local_map = self.stats.map_points
+        if hasattr(local_map, 'point_cloud'):
+            map_sensor = local_map.point_cloud()
+        elif isinstance(local_map, np.ndarray):
+            map_sensor = local_map
+        else:
+            map_sensor = None
+
+        self._map_cache = self._mount_points(map_sensor) if map_sensor is not None else None
+        self._map_cache_version = self._map_version
+        return self._map_cache
+
     def save_map(self, filename: str):
         """
         Save current map to PCD file (in robot frame)
@@ -270,24 +398,18 @@ class SlamPipeline:
             print("[SLAM] No map to save")
             return
 
-        # Extract points from VoxelHashMap
+        # Extract points from VoxelHashMap, in robot frame (reuses the
+        # array from the last register_frame if the map has not changed)
         try:
-            # KISS-ICP VoxelHashMap has point_cloud() method
-            if hasattr(self.stats.map_points, 'point_cloud'):
-                map_sensor = self.stats.map_points.point_cloud()
-            elif isinstance(self.stats.map_points, np.ndarray):
-                map_sensor = self.stats.map_points
-            else:
+            map_robot = self.get_map_in_robot_frame()
+            if map_robot is None:
                 print(f"[SLAM] Cannot extract points from map type: {type(self.stats.map_points)}")
                 return
 
-            if len(map_sensor) == 0:
+            if len(map_robot) == 0:
                 print("[SLAM] Map is empty")
                 return
 
-            # Transform from sensor frame to robot frame
-            map_robot = map_sensor @ self._R_MOUNT[:3, :3].T
-
             # Create point cloud
             pcd = o3d.geometry.PointCloud()
             pcd.points = o3d.utility.Vector3dVector(map_robot)
@@ -19,6 +19,7 @@ Controls:
 """
 import argparse
 import struct
+import threading
 import time
 import sys
 import os
@@ -37,6 +38,12 @@ except ImportError:
     print("ERROR: Open3D not installed. Run: pip3 install open3d")
     exit(1)
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 # Suppress Filament C++ stderr warnings globally (file descriptor level)
 class SuppressStderr:
@@ -61,12 +68,70 @@ VERSION = 1
 HDR_FMT = '<4sBId16fI'
 HDR_SIZE = struct.calcsize(HDR_FMT)
 
+# Header read in pieces: scalars via struct, the 16-float pose as a zero-copy
+# (4, 4) view (no 21-field tuple, no pose re-boxing)
+_HDR_HEAD = struct.Struct('<4sBId')    # magic, version, frame_id, t_sec
+_HDR_COUNT = struct.Struct('<I')        # point count, after the pose
+_POSE_OFFSET = _HDR_HEAD.size
+_COUNT_OFFSET = _POSE_OFFSET + 16 * 4
+assert _COUNT_OFFSET + _HDR_COUNT.size == HDR_SIZE
+
+# Trajectory history kept by the viewer (oldest poses drop off beyond this),
+# drawn as fixed-size LineSet chunks; TRAJ_CAP must be a multiple of TRAJ_CHUNK
+TRAJ_CHUNK = 1024
+TRAJ_CAP = 128 * TRAJ_CHUNK
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _colorize_by_height_kernel(pts, out):
+        """Fused colorize_by_height: z range in one pass, RGB written in a second"""
+        n = pts.shape[0]
+        z_min = np.inf
+        z_max = -np.inf
+        for i in prange(n):
+            z_min = min(z_min, pts[i, 2])
+            z_max = max(z_max, pts[i, 2])
+        z_min = max(z_min, -2.0)
+        z_max = min(z_max, 2.0)
+        scale = 1.0 / max(z_max - z_min, 0.01)
+        for i in prange(n):
+            v = min(max((pts[i, 2] - z_min) * scale, 0.0), 1.0)
+            out[i, 0] = v                        # Red
+            out[i, 1] = 1.0 - abs(v - 0.5) * 2   # Green (peak at 0.5)
+            out[i, 2] = 1.0 - v                  # Blue
+
+
+class FrameSlot:
+    """One decoded frame (flipped points, height colors, pose); buffers reused"""
+
+    def __init__(self):
+        self.pts = np.empty((0, 3), dtype=np.float32)
+        self.colors = np.empty((0, 3), dtype=np.float32)
+        self.pose = np.eye(4, dtype=np.float32)
+        self.count = 0
+        self.frame_id = 0
+        self.t_sec = 0.0
+        self.cloud_id = 0  # Same id as the previous slot when the points are identical
+
+    def reserve(self, n):
+        """Grow the point/color buffers to hold at least n points"""
+        if len(self.pts) < n:
+            self.pts = np.empty((n, 3), dtype=np.float32)
+            self.colors = np.empty((n, 3), dtype=np.float32)
+
 
 class SlamRealtimeViewer:
     def __init__(self, args):
         self.args = args
         self.running = True
 
+        # Coordinate flips as one per-axis sign vector (applied in one pass)
+        self._flip_sign = np.array([-1.0 if args.flip_x else 1.0,
+                                    -1.0 if args.flip_y else 1.0,
+                                    -1.0 if args.flip_z else 1.0], dtype=np.float32)
+        self._any_flip = bool(np.any(self._flip_sign < 0))
+
         # ZMQ setup
         print(f"→ Connecting to tcp://{args.server_ip}:{args.port}...")
         self.ctx = zmq.Context.instance()
@@ -81,8 +146,45 @@ class SlamRealtimeViewer:
         self.last_fps_time = time.time()
         self.fps_counter = 0
 
-        # Trajectory
-        self.trajectory_positions = []
+        # Trajectory: circular buffer of the last TRAJ_CAP positions
+        # (_traj_head = next write slot, _traj_total = positions ever appended)
+        self._traj_pts = np.empty((TRAJ_CAP, 3), dtype=np.float64)
+        self._traj_head = 0
+        self._traj_n = 0
+        self._traj_total = 0
+
+        # Drawn as scene geometries "trajectory_<k>", chunk k holding positions
+        # k*TRAJ_CHUNK .. (k+1)*TRAJ_CHUNK inclusive (so chunks join up). Full
+        # chunks are added once and left alone; only the open one is re-added.
+        # Live chunks are _traj_chunk_lo .. _traj_chunk_open.
+        self._traj_chunk_lo = 0
+        self._traj_chunk_open = 0
+        idx = np.arange(TRAJ_CHUNK, dtype=np.int32)
+        self._traj_lines = np.stack([idx, idx + 1], axis=1)
+        self._traj_colors = np.tile(np.array([0.0, 1.0, 0.0]), (TRAJ_CHUNK, 1))  # Green
+
+        # Trajectory LineSet re-upload is batched: every traj_upload_every
+        # appended poses, or sooner once traj_upload_dist meters of new path
+        # have accumulated since the last upload
+        self.traj_upload_every = max(1, args.traj_upload_every)
+        self.traj_upload_dist = 0.5
+        self._traj_dirty_count = 0
+        self._traj_dirty_len = 0.0
+
+        # Triple buffer between the I/O worker and the GUI thread: the worker
+        # decodes into the write slot, then swaps it with the ready slot; the
+        # GUI swaps ready with its read slot. Indices only change under the lock.
+        self._ring = [FrameSlot(), FrameSlot(), FrameSlot()]
+        self._write_idx, self._ready_idx, self._read_idx = 0, 1, 2
+        self._frame_ready = False
+        self._ring_lock = threading.Lock()
+        self._update_posted = False
+        self._io_thread = None
+        self._cloud_id = 0  # Last cloud_id handed out (I/O thread)
+        self._uploaded_cloud_id = None  # cloud_id of the cloud last sent to the GPU (GUI thread)
+        if NUMBA_AVAILABLE:
+            # Compile (or load from cache) before the first frame arrives
+            _colorize_by_height_kernel(np.zeros((1, 3), np.float32), np.empty((1, 3), np.float32))
 
         # Initialize GUI
         self.app = gui.Application.instance
@@ -100,6 +202,7 @@ class SlamRealtimeViewer:
         self.pcd = o3d.geometry.PointCloud()
         self.trajectory_line = o3d.geometry.LineSet()
         self.coord_frame = o3d.geometry.TriangleMesh.create_coordinate_frame(size=1.0)
+        self._coord_tf = np.eye(4, dtype=np.float32)  # Reused "coord" transform
 
         # Materials
         self.pcd_mat = rendering.MaterialRecord()
@@ -116,7 +219,7 @@ class SlamRealtimeViewer:
 
         # Add geometries to scene
         self.scene.scene.add_geometry("pcd", self.pcd, self.pcd_mat)
-        self.scene.scene.add_geometry("trajectory", self.trajectory_line, self.traj_mat)
+        self._pcd_count = 0  # Points in the current "pcd" GPU buffers
         self.scene.scene.add_geometry("coord", self.coord_frame, self.coord_mat)
 
         # Initial camera setup
@@ -129,9 +232,6 @@ class SlamRealtimeViewer:
         # Register keyboard events
         self.window.set_on_key(self.on_key)
 
-        # Update interval
-        self.update_interval = 0.01  # 10ms
-
         # Print usage
         print("\n" + "="*70)
         print("G1 SLAM Real-time Viewer")
@@ -147,16 +247,18 @@ class SlamRealtimeViewer:
         print("="*70 + "\n")
         print("Waiting for SLAM data...\n")
 
-        # Start update loop
-        self.schedule_update()
+        # Start the I/O worker (recv → parse → flip → colorize); it wakes the
+        # GUI thread whenever a new frame is ready
+        self._io_thread = threading.Thread(target=self._io_worker, daemon=True)
+        self._io_thread.start()
 
     def on_key(self, e):
         """Handle keyboard events"""
         # R: Reset camera
         if e.key == gui.KeyName.R and e.type == gui.KeyEvent.DOWN:
             # Reset camera to show current map
-            if len(self.trajectory_positions) > 0:
-                pts = np.array(self.trajectory_positions)
+            if self._traj_n > 0:
+                pts = self._traj_pts[:self._traj_n]  # Order irrelevant for the bbox
                 bbox = o3d.geometry.AxisAlignedBoundingBox(
                     pts.min(axis=0) - 1.0, pts.max(axis=0) + 1.0
                 )
@@ -171,22 +273,21 @@ class SlamRealtimeViewer:
 
         # C: Clear buffer
         if e.key == gui.KeyName.C and e.type == gui.KeyEvent.DOWN:
-            self.trajectory_positions.clear()
+            self._traj_n = 0
+            self._traj_head = 0
+            self._traj_dirty_count = 0
+            self._traj_dirty_len = 0.0
+            self._uploaded_cloud_id = None
 
             # Clear point cloud
-            self.pcd.points = o3d.utility.Vector3dVector(np.zeros((0, 3)))
-            self.pcd.colors = o3d.utility.Vector3dVector(np.zeros((0, 3)))
+            self.set_point_cloud(np.zeros((0, 3), np.float32), np.zeros((0, 3)))
 
             # Clear trajectory
-            self.trajectory_line.points = o3d.utility.Vector3dVector(np.zeros((0, 3)))
-            self.trajectory_line.lines = o3d.utility.Vector2iVector(np.zeros((0, 2)))
-
-            # Update scene (must remove/add to refresh)
             with SuppressStderr():
-                self.scene.scene.remove_geometry("pcd")
-                self.scene.scene.remove_geometry("trajectory")
-                self.scene.scene.add_geometry("pcd", self.pcd, self.pcd_mat)
-                self.scene.scene.add_geometry("trajectory", self.trajectory_line, self.traj_mat)
+                for k in range(self._traj_chunk_lo, self._traj_chunk_open + 1):
+                    self.scene.scene.remove_geometry(f"trajectory_{k}")
+            self._traj_total = 0
+            self._traj_chunk_lo = self._traj_chunk_open = 0
 
             print("✓ Buffer cleared")
             return True
@@ -199,56 +300,76 @@ class SlamRealtimeViewer:
 
         return False
 
-    def recv_frame(self):
-        """Receive and parse one frame"""
-        try:
-            buf = self.sub.recv(zmq.NOBLOCK)
-        except zmq.Again:
-            return None
+    def recv_frame(self, slot):
+        """
+        Receive all queued frames and parse only the newest into slot
+
+        Args:
+            slot: FrameSlot to decode into
+
+        Returns:
+            True if slot now holds a new frame
+        """
+        # Drain the queue; stale frames are dropped unparsed. (ZMQ_CONFLATE
+        # would do this in the transport but does not support the multipart
+        # [header, points] messages.)
+        parts = None
+        while True:
+            try:
+                parts = self.sub.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+        if parts is None:
+            return False
 
+        # Publisher sends [header, points]; a single frame is header + points
+        buf = parts[0]
         if len(buf) < HDR_SIZE:
-            return None
+            return False
 
         # Parse header
-        magic, ver, frame_id, t_sec, *pose16, count = struct.unpack(HDR_FMT, buf[:HDR_SIZE])
+        magic, ver, frame_id, t_sec = _HDR_HEAD.unpack_from(buf)
 
         if magic != MAGIC or ver != VERSION:
             if self.args.debug:
                 print(f"[WARN] Invalid packet: magic={magic}, ver={ver}")
-            return None
+            return False
+
+        (count,) = _HDR_COUNT.unpack_from(buf, _COUNT_OFFSET)
 
         # Parse points
-        payload = buf[HDR_SIZE:]
+        payload = parts[1] if len(parts) > 1 else memoryview(buf)[HDR_SIZE:]
         expected_size = count * 3 * 4  # 3 floats per point
         if len(payload) < expected_size:
             if self.args.debug:
                 print(f"[WARN] Payload size mismatch: got {len(payload)}, expected {expected_size}")
-            return None
-
-        pts = np.frombuffer(payload, dtype=np.float32, count=count*3).reshape((-1, 3)).copy()
-        pose = np.array(pose16, dtype=np.float32).reshape(4, 4)
+            return False
 
-        return {
-            'frame_id': frame_id,
-            't_sec': t_sec,
-            'pose': pose,
-            'points': pts
-        }
+        # Copy out of the read-only ZMQ buffers into the slot's arrays
+        slot.reserve(count)
+        np.copyto(slot.pts[:count],
+                  np.frombuffer(payload, dtype=np.float32, count=count*3).reshape((-1, 3)))
+        np.copyto(slot.pose,
+                  np.frombuffer(buf, dtype='<f4', count=16, offset=_POSE_OFFSET).reshape(4, 4))
+        slot.count = count
+        slot.frame_id = frame_id
+        slot.t_sec = t_sec
+        return True
 
     def apply_flips(self, pts):
-        """Apply coordinate flips"""
-        if self.args.flip_x:
-            pts[:, 0] = -pts[:, 0]
-        if self.args.flip_y:
-            pts[:, 1] = -pts[:, 1]
-        if self.args.flip_z:
-            pts[:, 2] = -pts[:, 2]
+        """Apply coordinate flips (in place)"""
+        if self._any_flip:
+            np.multiply(pts, self._flip_sign, out=pts)
         return pts
 
-    def colorize_by_height(self, pts):
-        """Color points by Z height (blue=low, green=mid, red=high)"""
+    def colorize_by_height(self, pts, out):
+        """Color points by Z height (blue=low, green=mid, red=high) into out"""
         if len(pts) == 0:
-            return np.zeros((0, 3))
+            return out[:0]
+
+        if NUMBA_AVAILABLE:
+            _colorize_by_height_kernel(np.ascontiguousarray(pts, dtype=np.float32), out)
+            return out
 
         z = pts[:, 2]
         z_min = max(z.min(), -2.0)
@@ -258,82 +379,134 @@ class SlamRealtimeViewer:
         norm = np.clip((z - z_min) / max(z_max - z_min, 0.01), 0, 1)
 
         # Blue -> Green -> Red gradient
-        colors = np.zeros((len(pts), 3))
-        colors[:, 0] = norm                    # Red
-        colors[:, 1] = 1.0 - np.abs(norm - 0.5) * 2  # Green (peak at 0.5)
-        colors[:, 2] = 1.0 - norm              # Blue
+        out[:, 0] = norm                    # Red
+        out[:, 1] = 1.0 - np.abs(norm - 0.5) * 2  # Green (peak at 0.5)
+        out[:, 2] = 1.0 - norm              # Blue
 
-        return colors
+        return out
 
     def update_trajectory(self, pose):
         """Update robot trajectory visualization"""
-        # Extract position from pose
-        position = pose[:3, 3].copy()
-
-        # Apply flips to position
-        if self.args.flip_x:
-            position[0] = -position[0]
-        if self.args.flip_y:
-            position[1] = -position[1]
-        if self.args.flip_z:
-            position[2] = -position[2]
-
-        self.trajectory_positions.append(position)
-
-        # Build line set
-        if len(self.trajectory_positions) >= 2:
-            points = np.array(self.trajectory_positions)
-            lines = [[i, i+1] for i in range(len(points)-1)]
+        # Extract position from pose, with flips applied
+        position = pose[:3, 3] * self._flip_sign
+
+        # Append into the ring (overwrites the oldest position once full)
+        head = self._traj_head
+        if self._traj_n > 0:
+            self._traj_dirty_len += float(np.linalg.norm(position - self._traj_pts[head - 1]))
+        self._traj_pts[head] = position
+        self._traj_head = (head + 1) % TRAJ_CAP
+        self._traj_n = min(self._traj_n + 1, TRAJ_CAP)
+        self._traj_total += 1
+        self._traj_dirty_count += 1
+
+        # Re-upload only once enough new path has accumulated
+        if (self._traj_dirty_count >= self.traj_upload_every or
+                self._traj_dirty_len >= self.traj_upload_dist):
+            self.upload_trajectory()
+
+    def upload_trajectory(self):
+        """
+        Push new trajectory segments to the scene
+
+        Re-adds only the chunks that gained positions since the last upload
+        (normally just the open one), so the cost is bounded by TRAJ_CHUNK
+        rather than the trajectory length. Chunks whose positions have all
+        left the ring are removed.
+        """
+        self._traj_dirty_count = 0
+        self._traj_dirty_len = 0.0
+        last = self._traj_total - 1  # Global index of the newest position
+        oldest = self._traj_total - self._traj_n
+        if self._traj_n < 2:
+            return
 
-            self.trajectory_line.points = o3d.utility.Vector3dVector(points.astype(np.float64))
-            self.trajectory_line.lines = o3d.utility.Vector2iVector(np.array(lines))
+        with SuppressStderr():
+            # Drop chunks that have aged out of the ring entirely
+            while (self._traj_chunk_lo + 1) * TRAJ_CHUNK <= oldest:
+                self.scene.scene.remove_geometry(f"trajectory_{self._traj_chunk_lo}")
+                self._traj_chunk_lo += 1
+
+            # Re-add the chunk(s) that grew: the previously open one (which may
+            # have been completed since) through the one holding the newest pose
+            for k in range(max(self._traj_chunk_open, self._traj_chunk_lo), last // TRAJ_CHUNK + 1):
+                g0 = max(k * TRAJ_CHUNK, oldest)
+                g1 = min((k + 1) * TRAJ_CHUNK, last)
+                m = g1 - g0  # Segments in this chunk
+                if m < 1:
+                    continue
+                pts = np.take(self._traj_pts, range(g0, g1 + 1), axis=0, mode='wrap')
+                self.trajectory_line.points = o3d.utility.Vector3dVector(pts)
+                self.trajectory_line.lines = o3d.utility.Vector2iVector(self._traj_lines[:m])
+
+                # Color: green for trajectory
+                self.trajectory_line.colors = o3d.utility.Vector3dVector(self._traj_colors[:m])
+
+                # Update scene (LineSets must be removed/added to refresh)
+                name = f"trajectory_{k}"
+                if self.scene.scene.has_geometry(name):
+                    self.scene.scene.remove_geometry(name)
+                self.scene.scene.add_geometry(name, self.trajectory_line, self.traj_mat)
+        self._traj_chunk_open = last // TRAJ_CHUNK
 
-            # Color: green for trajectory
-            colors = np.tile([0, 1, 0], (len(lines), 1))  # Green
-            self.trajectory_line.colors = o3d.utility.Vector3dVector(colors)
+    def update_robot_frame(self, pose):
+        """Update coordinate frame to follow robot position"""
+        # Apply flips to pose, into the reused float32 matrix (no copy/astype
+        # per frame)
+        pose_flipped = self._coord_tf
+        np.copyto(pose_flipped, pose)
+        pose_flipped[:3, 3] *= self._flip_sign
+
+        # Update transform only (the mesh is created once in __init__)
+        self.scene.scene.set_geometry_transform("coord", pose_flipped)
+
+    def set_point_cloud(self, pts, colors):
+        """
+        Upload map points and colors to the "pcd" geometry
+
+        When the point count matches the last add, only the point/color
+        buffers are re-uploaded (Scene.update_geometry). Any other count goes
+        through remove/add: Filament refuses (logs and ignores) an update
+        whose vertex count differs from the one the geometry was added with.
+        """
+        n = len(pts)
+        if n == 0:
+            self.pcd.points = o3d.utility.Vector3dVector(np.zeros((0, 3)))
+            self.pcd.colors = o3d.utility.Vector3dVector(np.zeros((0, 3)))
+            with SuppressStderr():
+                self.scene.scene.remove_geometry("pcd")
+                self.scene.scene.add_geometry("pcd", self.pcd, self.pcd_mat)
+            self._pcd_count = 0
+            return
 
-            # Update scene (must remove/add to refresh)
+        # float32 end to end (received points and kernel colors already are),
+        # so these asarray calls do not convert; Tensor() takes the one copy
+        tpcd = o3d.t.geometry.PointCloud(o3d.core.Tensor(np.asarray(pts, dtype=np.float32)))
+        tpcd.point.colors = o3d.core.Tensor(np.asarray(colors, dtype=np.float32))
+        if n == self._pcd_count:
+            self.scene.scene.scene.update_geometry(
+                "pcd", tpcd,
+                rendering.Scene.UPDATE_POINTS_FLAG | rendering.Scene.UPDATE_COLORS_FLAG)
+        else:
             with SuppressStderr():
-                self.scene.scene.remove_geometry("trajectory")
-                self.scene.scene.add_geometry("trajectory", self.trajectory_line, self.traj_mat)
+                self.scene.scene.remove_geometry("pcd")
+                self.scene.scene.add_geometry("pcd", tpcd, self.pcd_mat)
+            self._pcd_count = n
 
-    def update_robot_frame(self, pose):
-        """Update coordinate frame to follow robot position"""
-        # Apply flips to pose
-        pose_flipped = pose.copy()
-        if self.args.flip_x:
-            pose_flipped[0, 3] = -pose_flipped[0, 3]
-        if self.args.flip_y:
-            pose_flipped[1, 3] = -pose_flipped[1, 3]
-        if self.args.flip_z:
-            pose_flipped[2, 3] = -pose_flipped[2, 3]
-
-        # Update transform only (no need to recreate mesh)
-        self.scene.scene.set_geometry_transform("coord", pose_flipped.astype(np.float32))
-
-    def update_visualization(self, frame):
-        """Update point cloud buffer and visualization"""
-        pts = frame['points']
-        pose = frame['pose']
-
-        # Points are already in world coordinates (SLAM map)
-        # Just apply coordinate flips if needed
-        pts_world = self.apply_flips(pts)
-
-        # Colorize by height
-        colors = self.colorize_by_height(pts_world)
+    def update_visualization(self, slot):
+        """Update point cloud buffer and visualization (GUI thread)"""
+        # Points were flipped and colorized by the I/O worker
+        pts_world = slot.pts[:slot.count]
+        colors = slot.colors[:slot.count]
+        pose = slot.pose
 
         # Update trajectory
         self.update_trajectory(pose)
 
-        # Update point cloud
-        self.pcd.points = o3d.utility.Vector3dVector(pts_world.astype(np.float64))
-        self.pcd.colors = o3d.utility.Vector3dVector(colors.astype(np.float64))
-
-        # Update scene (must remove/add to refresh)
-        with SuppressStderr():
-            self.scene.scene.remove_geometry("pcd")
-            self.scene.scene.add_geometry("pcd", self.pcd, self.pcd_mat)
+        # Update point cloud (skipped when the GPU already holds this cloud)
+        if slot.cloud_id != self._uploaded_cloud_id:
+            self.set_point_cloud(pts_world, colors)
+            self._uploaded_cloud_id = slot.cloud_id
 
         # Update coordinate frame to follow robot
         self.update_robot_frame(pose)
@@ -345,50 +518,86 @@ class SlamRealtimeViewer:
         now = time.time()
         if now - self.last_fps_time >= 2.0:
             fps = self.fps_counter / (now - self.last_fps_time)
-            print(f"[STATS] Frame #{self.frame_count}, FPS={fps:.1f}, Points={len(pts_world)}, Trajectory={len(self.trajectory_positions)}")
+            print(f"[STATS] Frame #{self.frame_count}, FPS={fps:.1f}, Points={len(pts_world)}, Trajectory={self._traj_n}")
             self.last_fps_time = now
             self.fps_counter = 0
 
+    def _io_worker(self):
+        """Background thread: owns the SUB socket, decodes frames into the ring"""
+        poller = zmq.Poller()
+        poller.register(self.sub, zmq.POLLIN)
+        prev = None  # Last published slot (never the write slot)
+
+        while self.running:
+            # Short poll timeout so shutdown is noticed promptly
+            if not poller.poll(50):
+                continue
+
+            slot = self._ring[self._write_idx]
+            if not self.recv_frame(slot):
+                continue
+
+            # Points are already in world coordinates (SLAM map)
+            # Just apply coordinate flips if needed, then colorize by height
+            pts = self.apply_flips(slot.pts[:slot.count])
+            # Exact comparison with the last frame (memcmp speed): SLAM keeps
+            # re-sending the same accumulated map between updates
+            if (prev is not None and slot.count == prev.count and
+                    np.array_equal(pts, prev.pts[:prev.count])):
+                # Unchanged map: reuse the last colors instead of recomputing
+                np.copyto(slot.colors[:slot.count], prev.colors[:slot.count])
+                slot.cloud_id = prev.cloud_id
+            else:
+                self.colorize_by_height(pts, slot.colors[:slot.count])
+                self._cloud_id += 1
+                slot.cloud_id = self._cloud_id
+            prev = slot
+
+            # Publish: the decoded slot becomes ready, the old ready slot (if
+            # the GUI never took it) is overwritten next
+            with self._ring_lock:
+                self._write_idx, self._ready_idx = self._ready_idx, self._write_idx
+                self._frame_ready = True
+            self.schedule_update()
+
+    def _take_ready_slot(self):
+        """Swap the ready slot into the GUI's read position (None if no new frame)"""
+        with self._ring_lock:
+            if not self._frame_ready:
+                return None
+            self._read_idx, self._ready_idx = self._ready_idx, self._read_idx
+            self._frame_ready = False
+        return self._ring[self._read_idx]
+
     def update_geometry(self):
-        """Update geometry from ZMQ stream"""
+        """Upload the newest decoded frame (GUI thread)"""
+        # Clear before taking the slot so a frame published meanwhile re-posts
+        self._update_posted = False
         if not self.running:
             return False
 
-        # Poll for frames (get latest)
-        frame = None
-        for _ in range(10):  # Try to get latest frame
-            new_frame = self.recv_frame()
-            if new_frame is not None:
-                frame = new_frame
-            else:
-                break
-
-        # Update visualization if we got a frame
-        if frame is not None:
-            self.update_visualization(frame)
+        slot = self._take_ready_slot()
+        if slot is not None:
+            self.update_visualization(slot)
 
         return True
 
     def schedule_update(self):
-        """Schedule next geometry update"""
-        if not self.running:
+        """Ask the GUI thread to run update_geometry (at most one pending request)"""
+        if not self.running or self._update_posted:
             return
-
-        # Update geometry
-        self.update_geometry()
-
-        # Schedule next update
-        gui.Application.instance.post_to_main_thread(
-            self.window,
-            lambda: self.schedule_update() if self.running else None
-        )
+        self._update_posted = True
+        gui.Application.instance.post_to_main_thread(self.window, self.update_geometry)
 
     def run(self):
         """Run the main application loop"""
         print("[INFO] Starting viewer...\n")
         self.app.run()
 
-        # Cleanup
+        # Cleanup (the worker owns the socket; stop it before closing)
+        self.running = False
+        if self._io_thread is not None:
+            self._io_thread.join(timeout=1.0)
         self.sub.close()
         self.ctx.term()
         print("\n✓ Viewer closed")
@@ -413,6 +622,10 @@ def parse_args():
     parser.add_argument('--flip-z', action='store_true',
                         help='Flip Z axis')
 
+    # Display
+    parser.add_argument('--traj-upload-every', type=int, default=15,
+                        help='Re-upload the trajectory line every N frames (or after 0.5 m of new path)')
+
     # Debug
     parser.add_argument('--debug', action='store_true',
                         help='Enable debug logging')
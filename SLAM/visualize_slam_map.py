@@ -24,6 +24,10 @@ Usage:
 
     # Custom map and trajectory files
     python3 visualize_slam_map.py --map path/to/map.pcd --traj path/to/trajectory.csv
+
+The processed map and trajectory are cached in <map>.viewcache.npz next to the
+map, so re-opening an unchanged session with the same --voxel skips parsing,
+downsampling, and colorizing (--no-cache to bypass).
 """
 
 import argparse
@@ -33,11 +37,70 @@ import open3d as o3d
 from pathlib import Path
 from datetime import datetime
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Maps at least this large are voxel-downsampled on the GPU when Open3D has
+# CUDA (below it the host->device copy outweighs the gain)
+GPU_VOXEL_MIN_POINTS = 500_000
+
+# Binary PCDs are voxelized from a memory map this many points at a time
+PCD_BLOCK_POINTS = 4_000_000
+_PCD_TYPE_KIND = {'F': 'f', 'I': 'i', 'U': 'u'}  # PCD TYPE -> numpy dtype kind
+
+# np.loadtxt parses in C from numpy 1.23; older versions (still allowed by
+# requirements.txt, common on Jetson images) parse line by line in Python
+_LOADTXT_IS_C = tuple(int(v) for v in np.__version__.split('.')[:2]) >= (1, 23)
+
+# Bump when the cached arrays change meaning (invalidates old caches)
+CACHE_VERSION = 1
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _quat_to_rot_kernel(q, out):
+        """
+        Write rotation matrices for quaternions straight into `out`
+
+        Args:
+            q: Quaternions (N, 4) as (qx, qy, qz, qw)
+            out: Output (N, 3, 3) array, may be a strided view (e.g. poses[:, :3, :3])
+        """
+        for i in range(q.shape[0]):
+            x = q[i, 0]
+            y = q[i, 1]
+            z = q[i, 2]
+            w = q[i, 3]
+            out[i, 0, 0] = 1 - 2 * (y * y + z * z)
+            out[i, 0, 1] = 2 * (x * y - z * w)
+            out[i, 0, 2] = 2 * (x * z + y * w)
+            out[i, 1, 0] = 2 * (x * y + z * w)
+            out[i, 1, 1] = 1 - 2 * (x * x + z * z)
+            out[i, 1, 2] = 2 * (y * z - x * w)
+            out[i, 2, 0] = 2 * (x * z - y * w)
+            out[i, 2, 1] = 2 * (y * z + x * w)
+            out[i, 2, 2] = 1 - 2 * (x * x + y * y)
+
+    @njit(cache=True, fastmath=True)
+    def _path_length_kernel(positions):
+        """Sum of segment lengths along positions (N, 3), no temporaries"""
+        total = 0.0
+        for i in range(1, positions.shape[0]):
+            dx = positions[i, 0] - positions[i - 1, 0]
+            dy = positions[i, 1] - positions[i - 1, 1]
+            dz = positions[i, 2] - positions[i - 1, 2]
+            total += np.sqrt(dx * dx + dy * dy + dz * dz)
+        return total
+
 
 class SlamMapVisualizer:
     """Enhanced visualizer for SLAM maps and trajectories"""
 
-    def __init__(self, map_path=None, traj_path=None, meta_path=None, voxel_size=0.0):
+    def __init__(self, map_path=None, traj_path=None, meta_path=None, voxel_size=0.0,
+                 use_cache=True):
         """
         Initialize visualizer
 
@@ -46,14 +109,17 @@ class SlamMapVisualizer:
             traj_path: Path to .csv trajectory file (TUM format)
             meta_path: Path to run_meta.json file (optional)
             voxel_size: Voxel downsampling size (0 = no downsampling)
+            use_cache: Reuse/write the processed map and trajectory in a
+                <map>.viewcache.npz next to the map file
         """
         self.map_path = map_path
         self.traj_path = traj_path
         self.meta_path = meta_path
         self.voxel_size = voxel_size
+        self.use_cache = use_cache
 
         self.map_pcd = None
-        self.poses = []
+        self.poses = np.empty((0, 4, 4))  # (N, 4, 4) pose matrices
         self.metadata = None
 
     def load_data(self):
@@ -68,18 +134,42 @@ class SlamMapVisualizer:
                 self.metadata = json.load(f)
             self._print_metadata()
 
+        # Processed arrays from an earlier run, if the sources are unchanged
+        if self.use_cache and self._load_cache():
+            return
+
         # Load point cloud map
         if self.map_path and Path(self.map_path).exists():
             print(f"\nLoading map: {self.map_path}")
-            self.map_pcd = o3d.io.read_point_cloud(str(self.map_path))
 
-            original_points = len(self.map_pcd.points)
-            print(f"  Original points: {original_points:,}")
+            # Binary PCD + downsampling: voxelize straight from the file
+            streamed = None
+            if self.voxel_size > 0 and Path(self.map_path).suffix.lower() == '.pcd':
+                streamed = self._read_pcd_downsampled(self.map_path)
+
+            if streamed is not None:
+                points, original_points = streamed
+                self.map_pcd = o3d.geometry.PointCloud()
+                self.map_pcd.points = o3d.utility.Vector3dVector(points)
+                print(f"  Original points: {original_points:,}")
+                print(f"  Downsampled from disk with voxel size: {self.voxel_size}m")
+                ratio = len(points) / max(original_points, 1) * 100
+                print(f"  Downsampled points: {len(points):,} ({ratio:.1f}%)")
+            else:
+                self.map_pcd = o3d.io.read_point_cloud(str(self.map_path))
+                original_points = len(self.map_pcd.points)
+                print(f"  Original points: {original_points:,}")
+
+                # Normals are unused (points are colored by height); without them the
+                # downsample averages less and Open3D draws the map unlit, as it does
+                # for a cached load
+                if self.map_pcd.has_normals():
+                    self.map_pcd.normals = o3d.utility.Vector3dVector()
 
             # Downsample if requested
-            if self.voxel_size > 0:
+            if self.voxel_size > 0 and streamed is None:
                 print(f"  Downsampling with voxel size: {self.voxel_size}m")
-                self.map_pcd = self.map_pcd.voxel_down_sample(voxel_size=self.voxel_size)
+                self.map_pcd = self._voxel_down_sample(self.map_pcd)
                 downsampled_points = len(self.map_pcd.points)
                 ratio = downsampled_points / original_points * 100
                 print(f"  Downsampled points: {downsampled_points:,} ({ratio:.1f}%)")
@@ -95,45 +185,228 @@ class SlamMapVisualizer:
             self.poses = self._load_trajectory(self.traj_path)
             print(f"  Poses loaded: {len(self.poses):,}")
 
-            if self.poses:
+            if len(self.poses) > 0:
                 distance = self._calculate_trajectory_distance()
                 print(f"  Total distance: {distance:.2f}m")
         else:
             print(f"\nWarning: Trajectory file not found: {self.traj_path}")
 
+        if self.use_cache:
+            self._save_cache()
+
+    def _cache_path(self):
+        """Cache file next to the map (None without a map)"""
+        if not self.map_path or not Path(self.map_path).exists():
+            return None
+        map_path = Path(self.map_path)
+        return map_path.with_name(map_path.stem + '.viewcache.npz')
+
+    def _cache_key(self):
+        """Cache format version plus (mtime, size) of the map and trajectory files"""
+        key = [CACHE_VERSION]
+        for path in (self.map_path, self.traj_path):
+            if path and Path(path).exists():
+                st = Path(path).stat()
+                key += [st.st_mtime_ns, st.st_size]
+            else:
+                key += [-1, -1]
+        return np.array(key, dtype=np.int64)
+
+    def _load_cache(self):
+        """
+        Restore the downsampled, colored map and the poses from the cache
+
+        Returns:
+            True if a fresh cache was loaded (read/downsample/colorize skipped)
+        """
+        cache_path = self._cache_path()
+        if cache_path is None or not cache_path.exists():
+            return False
+
+        try:
+            with np.load(cache_path) as cache:
+                if (not np.array_equal(cache['key'], self._cache_key()) or
+                        float(cache['voxel_size']) != self.voxel_size):
+                    return False
+                points = cache['points']
+                colors = cache['colors']
+                poses = cache['poses']
+        except Exception as e:
+            print(f"\nWarning: Ignoring unreadable cache {cache_path}: {e}")
+            return False
+
+        print(f"\nLoaded cached map/trajectory: {cache_path}")
+        self.map_pcd = o3d.geometry.PointCloud()
+        self.map_pcd.points = o3d.utility.Vector3dVector(points.astype(np.float64))
+        self.map_pcd.paint_uniform_color([0.0, 0.0, 0.0])
+        np.copyto(np.asarray(self.map_pcd.colors), colors)  # float32 -> float64 in place
+        print(f"  Map points: {len(points):,}")
+
+        self.poses = poses
+        print(f"  Poses loaded: {len(self.poses):,}")
+        if len(self.poses) > 0:
+            distance = self._calculate_trajectory_distance()
+            print(f"  Total distance: {distance:.2f}m")
+        return True
+
+    def _save_cache(self):
+        """Write the processed map (float32) and poses for the next run"""
+        cache_path = self._cache_path()
+        if cache_path is None or self.map_pcd is None:
+            return
+
+        tmp_path = cache_path.with_name(cache_path.stem + '.tmp.npz')
+        try:
+            np.savez(tmp_path,
+                     key=self._cache_key(),
+                     voxel_size=np.float64(self.voxel_size),
+                     points=np.asarray(self.map_pcd.points, dtype=np.float32),
+                     colors=np.asarray(self.map_pcd.colors, dtype=np.float32),
+                     poses=self.poses)
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            print(f"\nWarning: Could not write cache {cache_path}: {e}")
+
+    def _voxel_down_sample(self, pcd):
+        """
+        Voxel downsample, on CUDA for large maps when available
+
+        Only positions go to the GPU (as float32); colors are assigned after
+        loading anyway. Falls back to the legacy CPU path otherwise.
+        """
+        if len(pcd.points) >= GPU_VOXEL_MIN_POINTS and o3d.core.cuda.is_available():
+            try:
+                device = o3d.core.Device("CUDA:0")
+                t_pcd = o3d.t.geometry.PointCloud(device)
+                t_pcd.point.positions = o3d.core.Tensor(
+                    np.asarray(pcd.points, dtype=np.float32), device=device)
+                print("  (CUDA)")
+                return t_pcd.voxel_down_sample(self.voxel_size).to_legacy()
+            except Exception as e:
+                print(f"  Warning: GPU downsample failed ({e}), using CPU")
+
+        return pcd.voxel_down_sample(voxel_size=self.voxel_size)
+
+    def _read_pcd_downsampled(self, pcd_path):
+        """
+        Voxel-downsample a binary PCD without loading it (Open3D's parser skipped)
+
+        The point block is memory-mapped and voxelized PCD_BLOCK_POINTS at a time
+        with integer voxel keys; each voxel keeps its first point (Open3D averages
+        them), so peak RAM follows the downsampled map, not the file.
+
+        Args:
+            pcd_path: Path to the .pcd file
+
+        Returns:
+            (points (M, 3) float64, original point count), or None when the file is
+            not an uncompressed binary PCD with float x/y/z (use Open3D instead)
+        """
+        header = {}
+        try:
+            with open(pcd_path, 'rb') as f:
+                while 'DATA' not in header:
+                    line = f.readline()
+                    if not line:
+                        return None
+                    parts = line.decode('ascii', 'replace').split()
+                    if parts and not parts[0].startswith('#'):
+                        header[parts[0].upper()] = parts[1:]
+                data_offset = f.tell()
+
+            fields = header.get('FIELDS', [])
+            sizes = header.get('SIZE', [])
+            types = header.get('TYPE', [])
+            counts = header.get('COUNT', ['1'] * len(fields))
+            if (header['DATA'] != ['binary'] or
+                    not len(fields) == len(sizes) == len(types) == len(counts)):
+                return None
+
+            # Padding fields may repeat ('_'), numpy needs unique names
+            record = np.dtype([(name if name in ('x', 'y', 'z') else f'_{i}',
+                                f'<{_PCD_TYPE_KIND[t]}{sz}', (int(c),))
+                               for i, (name, sz, t, c) in enumerate(zip(fields, sizes, types, counts))])
+            if any(record[a].base.kind != 'f' or record[a].shape != (1,) for a in 'xyz'):
+                return None
+            if 'POINTS' in header:
+                n = int(header['POINTS'][0])
+            else:
+                n = int(header['WIDTH'][0]) * int(header['HEIGHT'][0])
+            if n == 0:
+                return np.zeros((0, 3)), 0
+            data = np.memmap(pcd_path, dtype=record, mode='r', offset=data_offset, shape=(n,))
+        except (KeyError, ValueError, TypeError, OSError):
+            return None
+
+        inv_voxel = 1.0 / self.voxel_size
+        bias = 1 << 20  # Keys pack 3 x 21-bit voxel indices (±2^20 voxels per axis)
+        block_keys, block_points = [], []
+        for start in range(0, n, PCD_BLOCK_POINTS):
+            block = data[start:start + PCD_BLOCK_POINTS]
+            pts = np.stack([block['x'][:, 0], block['y'][:, 0], block['z'][:, 0]], axis=1)
+            pts = pts[np.isfinite(pts).all(axis=1)]
+            if len(pts) == 0:
+                continue
+            ijk = np.floor(pts * inv_voxel).astype(np.int64) + bias
+            if ijk.min() < 0 or ijk.max() >= 2 * bias:
+                return None  # Extent too large for the packed key
+            keys = (ijk[:, 0] << 42) | (ijk[:, 1] << 21) | ijk[:, 2]
+            keys, first = np.unique(keys, return_index=True)
+            block_keys.append(keys)
+            block_points.append(pts[first])
+
+        if not block_keys:
+            return np.zeros((0, 3)), n
+        keys = np.concatenate(block_keys)
+        _, first = np.unique(keys, return_index=True)
+        return np.concatenate(block_points)[first].astype(np.float64), n
+
     def _load_trajectory(self, csv_path):
-        """Load trajectory from TUM format CSV"""
-        arr = np.loadtxt(csv_path, dtype=np.float64)
-        if arr.ndim == 1:
-            arr = arr[None, :]
-
-        poses = []
-        for row in arr:
-            t, tx, ty, tz, qx, qy, qz, qw = row
-            R = self._quat_to_rot(qx, qy, qz, qw)
-            T = np.eye(4)
-            T[:3, :3] = R
-            T[:3, 3] = [tx, ty, tz]
-            poses.append(T)
+        """
+        Load trajectory from TUM format CSV
 
+        Returns:
+            Poses (N, 4, 4), built for all rows at once
+        """
+        if _LOADTXT_IS_C:
+            arr = np.loadtxt(csv_path, dtype=np.float64, ndmin=2)
+        else:
+            # One C-level parse of the whole file (TUM rows: 8 whitespace-separated values)
+            text = Path(csv_path).read_text()
+            if '#' in text:
+                text = '\n'.join(line.split('#', 1)[0] for line in text.splitlines())
+            arr = np.fromstring(text, dtype=np.float64, sep=' ')
+            if arr.size % 8:
+                raise ValueError(f"{csv_path}: expected 8 values per row (TUM format)")
+            arr = arr.reshape(-1, 8)
+
+        poses = np.zeros((len(arr), 4, 4))
+        if NUMBA_AVAILABLE:
+            _quat_to_rot_kernel(arr[:, 4:8], poses[:, :3, :3])
+        else:
+            poses[:, :3, :3] = self._quat_to_rot(arr[:, 4:8])
+        poses[:, :3, 3] = arr[:, 1:4]
+        poses[:, 3, 3] = 1.0
         return poses
 
     @staticmethod
-    def _quat_to_rot(qx, qy, qz, qw):
-        """Convert quaternion to rotation matrix"""
-        x, y, z, w = qx, qy, qz, qw
-        return np.array([
-            [1-2*(y*y+z*z),   2*(x*y - z*w),   2*(x*z + y*w)],
-            [  2*(x*y + z*w), 1-2*(x*x+z*z),   2*(y*z - x*w)],
-            [  2*(x*z - y*w),   2*(y*z + x*w), 1-2*(x*x+y*y)]
-        ], dtype=np.float64)
+    def _quat_to_rot(q):
+        """Convert quaternions (N, 4) as (qx, qy, qz, qw) to rotation matrices (N, 3, 3)"""
+        x, y, z, w = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+        return np.stack([
+            1-2*(y*y+z*z),   2*(x*y - z*w),   2*(x*z + y*w),
+              2*(x*y + z*w), 1-2*(x*x+z*z),   2*(y*z - x*w),
+              2*(x*z - y*w),   2*(y*z + x*w), 1-2*(x*x+y*y)
+        ], axis=-1).reshape(-1, 3, 3)
 
     def _calculate_trajectory_distance(self):
         """Calculate total trajectory distance"""
         if len(self.poses) < 2:
             return 0.0
 
-        positions = np.array([T[:3, 3] for T in self.poses])
+        positions = self.poses[:, :3, 3]  # Strided view, no copy
+        if NUMBA_AVAILABLE:
+            return _path_length_kernel(positions)
         deltas = np.diff(positions, axis=0)
         distances = np.linalg.norm(deltas, axis=1)
         return np.sum(distances)
@@ -148,16 +421,21 @@ class SlamMapVisualizer:
         z_min = max(z.min(), -2.0)
         z_max = min(z.max(), 2.0)
 
-        # Normalize to [0, 1]
-        norm = np.clip((z - z_min) / max(z_max - z_min, 0.01), 0, 1)
+        # Color storage is allocated by Open3D and written in place through a
+        # NumPy view (no NumPy array copied into a Vector3dVector afterwards)
+        self.map_pcd.paint_uniform_color([0.0, 0.0, 0.0])
+        colors = np.asarray(self.map_pcd.colors)
+        red, green, blue = colors[:, 0], colors[:, 1], colors[:, 2]
 
-        # Blue -> Green -> Red gradient
-        colors = np.zeros((len(pts), 3))
-        colors[:, 0] = norm                           # Red
-        colors[:, 1] = 1.0 - np.abs(norm - 0.5) * 2  # Green (peak at 0.5)
-        colors[:, 2] = 1.0 - norm                     # Blue
+        # Normalize to [0, 1] (red is the normalized height itself)
+        np.subtract(z, z_min, out=red)
+        np.multiply(red, 1.0 / max(z_max - z_min, 0.01), out=red)
+        np.clip(red, 0, 1, out=red)
 
-        self.map_pcd.colors = o3d.utility.Vector3dVector(colors)
+        # Blue -> Green -> Red gradient
+        np.subtract(1.0, red, out=blue)              # Blue
+        np.minimum(red, blue, out=green)             # Green (peak at 0.5):
+        np.multiply(green, 2.0, out=green)           # 1 - |n - 0.5|*2 == 2*min(n, 1-n)
 
     def _print_metadata(self):
         """Print metadata information"""
@@ -187,40 +465,56 @@ class SlamMapVisualizer:
             return None
 
         # Extract positions
-        positions = np.array([T[:3, 3] for T in self.poses], dtype=np.float64)
+        positions = np.ascontiguousarray(self.poses[:, :3, 3])
 
-        # Create line indices
-        lines = [[i, i+1] for i in range(len(positions)-1)]
-
-        # Green color for all trajectory lines (same as viewer_realtime.py)
-        colors = np.tile([0, 1, 0], (len(lines), 1))  # Green
+        # Create line indices ([i, i+1] segments)
+        idx = np.arange(len(positions) - 1, dtype=np.int32)
+        lines = np.stack([idx, idx + 1], axis=1)
 
         # Create line set
         line_set = o3d.geometry.LineSet(
             points=o3d.utility.Vector3dVector(positions),
             lines=o3d.utility.Vector2iVector(lines)
         )
-        line_set.colors = o3d.utility.Vector3dVector(colors)
+
+        # Green color for all trajectory lines (same as viewer_realtime.py), filled
+        # in C++ (an int64 np.tile would take Vector3dVector's per-element path)
+        line_set.paint_uniform_color([0.0, 1.0, 0.0])
 
         return line_set
 
     def _create_pose_spheres(self, stride=100):
-        """Create small spheres at pose locations"""
-        if not self.poses:
+        """
+        Create small spheres at pose locations
+
+        All spheres are copies of one tessellated sphere, merged into a single
+        vertex-colored mesh (one geometry to draw instead of one per pose).
+
+        Returns:
+            List with the combined sphere mesh (empty if no poses)
+        """
+        if len(self.poses) == 0:
             return []
 
-        spheres = []
-        for i in range(0, len(self.poses), stride):
-            pos = self.poses[i][:3, 3]
-            sphere = o3d.geometry.TriangleMesh.create_sphere(radius=0.05)
-            sphere.translate(pos)
+        proto = o3d.geometry.TriangleMesh.create_sphere(radius=0.05)
+        V = np.asarray(proto.vertices)
+        F = np.asarray(proto.triangles)
+
+        idx = np.arange(0, len(self.poses), stride)
+        positions = self.poses[idx, :3, 3]
+        k = len(idx)
+
+        # Color based on position in trajectory
+        ratio = idx / max(1, len(self.poses)-1)
+        colors = np.column_stack([ratio, np.full(k, 0.2), 1 - ratio])
 
-            # Color based on position in trajectory
-            ratio = i / max(1, len(self.poses)-1)
-            sphere.paint_uniform_color([ratio, 0.2, 1-ratio])
-            spheres.append(sphere)
+        spheres = o3d.geometry.TriangleMesh()
+        spheres.vertices = o3d.utility.Vector3dVector((V[None] + positions[:, None]).reshape(-1, 3))
+        spheres.triangles = o3d.utility.Vector3iVector(
+            (F[None] + (np.arange(k) * len(V))[:, None, None]).reshape(-1, 3).astype(np.int32))
+        spheres.vertex_colors = o3d.utility.Vector3dVector(np.repeat(colors, len(V), axis=0))
 
-        return spheres
+        return [spheres]
 
     def visualize(self, show_frames=True, show_spheres=False, sphere_stride=100):
         """
@@ -238,7 +532,7 @@ class SlamMapVisualizer:
             geometries.append(self.map_pcd)
 
         # Add trajectory line
-        if self.poses:
+        if len(self.poses) > 0:
             traj_lines = self._create_trajectory_lines()
             if traj_lines is not None:
                 geometries.append(traj_lines)
@@ -298,6 +592,7 @@ class SlamMapVisualizer:
         render_option.background_color = np.array([0.1, 0.1, 0.15])  # Dark gray background
         render_option.point_size = 2.0  # Same point size as viewer_realtime
         render_option.show_coordinate_frame = True
+        render_option.point_show_normal = False
 
         # Reset view to fit all geometries
         vis.reset_view_point(True)
@@ -306,7 +601,9 @@ class SlamMapVisualizer:
         vis.poll_events()
         vis.update_renderer()
 
-        # Run visualizer with proper mouse controls
+        # Run visualizer with proper mouse controls. With no animation callback
+        # registered, run() blocks on window events and only redraws on input,
+        # so the static map costs no GPU time while idle
         vis.run()
         vis.destroy_window()
 
@@ -361,6 +658,8 @@ Examples:
     parser.add_argument('--maps-dir', type=str,
                         default='/home/unitree/AIM-Robotics/SLAM/maps',
                         help='Base maps directory')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the processed map/trajectory cache')
     parser.add_argument('--no-frames', action='store_true',
                         help='Do not show coordinate frames at start/end')
     parser.add_argument('--show-spheres', action='store_true',
@@ -398,7 +697,8 @@ Examples:
         map_path=map_path,
         traj_path=traj_path,
         meta_path=meta_path,
-        voxel_size=args.voxel
+        voxel_size=args.voxel,
+        use_cache=not args.no_cache
     )
 
     # Load data
@@ -5,12 +5,22 @@ Real-time object detection with RealSense D435i, streaming to Mac via UDP
 """
 import pyrealsense2 as rs
 import numpy as np
+import os
 import socket
 import time
 import sys
 import cv2
 import struct
+import threading
+from collections import deque
 from ultralytics import YOLO  # type: ignore
+from ultralytics.utils.plotting import Annotator, colors  # type: ignore
+
+try:
+    from nvjpeg import NvJpeg  # type: ignore  # GPU JPEG encoder (pip3 install pynvjpeg)
+    NVJPEG_AVAILABLE = True
+except ImportError:
+    NVJPEG_AVAILABLE = False
 
 # ============================================================
 # Configuration
@@ -18,8 +28,11 @@ from ultralytics import YOLO  # type: ignore
 MAC_IP = "192.168.123.99"
 RGB_PORT = 8889
 CHUNK_SIZE = 60000
+CHUNK_HEADER = struct.Struct('!III')  # sequence_id, chunk_index, total_chunks
 
 YOLO_MODEL = "yolov8n.pt"
+YOLO_ENGINE = os.path.splitext(YOLO_MODEL)[0] + ".engine"  # TensorRT FP16 build of YOLO_MODEL (exported on first run)
+YOLO_IMGSZ = 640                # Inference size the engine is built for
 YOLO_CONF = 0.5
 
 JETSON_WIFI_IP = "192.168.123.164"  # eth0 IP (wired)
@@ -33,8 +46,11 @@ SEND_BUFFER_SIZE = 2 * 1024 * 1024
 # ============================================================
 # Helper Functions
 # ============================================================
+header_buf = bytearray(CHUNK_HEADER.size)  # Copied by the kernel on each sendmsg
+
 def send_chunked_data(sock, data, target_ip, target_port, sequence_id):
     """Split large data into chunks and send via UDP"""
+    data = memoryview(data)  # Chunks below are views, not copies
     data_size = len(data)
     total_chunks = (data_size + CHUNK_SIZE - 1) // CHUNK_SIZE
 
@@ -43,9 +59,17 @@ def send_chunked_data(sock, data, target_ip, target_port, sequence_id):
         end = min(start + CHUNK_SIZE, data_size)
         chunk_data = data[start:end]
 
-        header = struct.pack('!III', sequence_id, chunk_idx, total_chunks)
-        packet = header + chunk_data
-        sock.sendto(packet, (target_ip, target_port))
+        # Header packed into one reused buffer; header and chunk go out as
+        # one datagram (no concatenated copy)
+        CHUNK_HEADER.pack_into(header_buf, 0, sequence_id, chunk_idx, total_chunks)
+        sock.sendmsg([header_buf, chunk_data], [], 0, (target_ip, target_port))
+
+def encode_jpeg(image):
+    """JPEG-encode a BGR frame: nvJPEG on the GPU when available, else OpenCV on the CPU"""
+    if jpeg_encoder is not None:
+        return jpeg_encoder.encode(image, JPEG_QUALITY)
+    _, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    return encoded
 
 # ============================================================
 # Initialization
@@ -57,11 +81,20 @@ print(f"\nConfiguration:")
 print(f"  Target IP:    {MAC_IP}")
 print(f"  RGB Port:     {RGB_PORT}")
 print(f"  Resolution:   {REALSENSE_WIDTH}x{REALSENSE_HEIGHT} @ {REALSENSE_FPS}fps")
-print(f"  YOLO Model:   {YOLO_MODEL}")
+print(f"  YOLO Model:   {YOLO_MODEL} (TensorRT: {YOLO_ENGINE})")
 print(f"  YOLO Conf:    {YOLO_CONF}")
 print(f"  Chunk size:   {CHUNK_SIZE // 1000}KB")
 print("=" * 60)
 
+# JPEG encoder (falls back to cv2.imencode if nvJPEG is missing or fails)
+jpeg_encoder = None
+if NVJPEG_AVAILABLE:
+    try:
+        jpeg_encoder = NvJpeg()
+    except Exception as e:
+        print(f"Warning: nvJPEG init failed ({e}), using OpenCV JPEG")
+print(f"\nJPEG encoder: {'nvJPEG (GPU)' if jpeg_encoder is not None else 'OpenCV (CPU)'}")
+
 # UDP Socket
 print("\n[1/5] Initializing UDP socket...")
 try:
@@ -76,10 +109,24 @@ except Exception as e:
 # YOLO Model
 print("\n[2/5] Loading YOLO model...")
 try:
-    model = YOLO(YOLO_MODEL)
-    print(f"  ✓ YOLOv8 model loaded: {YOLO_MODEL}")
+    # TensorRT FP16 engine (2-4x faster than PyTorch on Jetson); PyTorch if it can't be built
+    engine_path = YOLO_ENGINE
+    if not os.path.exists(engine_path):
+        try:
+            print("  - Exporting TensorRT FP16 engine (one-time, takes a few minutes)...")
+            engine_path = YOLO(YOLO_MODEL).export(format="engine", device=0, half=True, imgsz=YOLO_IMGSZ) or YOLO_ENGINE
+        except Exception as e:
+            print(f"  ⚠ TensorRT export failed ({e}), using PyTorch model")
+    use_engine = os.path.exists(engine_path)
+    model_path = engine_path if use_engine else YOLO_MODEL
+
+    model = YOLO(model_path, task="detect")
+    print(f"  ✓ YOLOv8 model loaded: {model_path}")
     print(f"  - Classes: {len(model.names)} (COCO dataset)")
-    print(f"  - Device: {'CUDA' if model.device.type == 'cuda' else 'CPU'}")
+    if use_engine:
+        print("  - Device: CUDA (TensorRT FP16)")
+    else:
+        print(f"  - Device: {'CUDA' if model.device.type == 'cuda' else 'CPU'}")
 except Exception as e:
     print(f"✗ YOLO initialization failed: {e}")
     sys.exit(1)
@@ -108,9 +155,13 @@ try:
     color_stream = profile.get_stream(rs.stream.color).as_video_stream_profile()
     intrinsics = color_stream.get_intrinsics()
 
+    # z16 units -> meters (what depth_frame.get_distance() applies per call)
+    depth_scale = profile.get_device().first_depth_sensor().get_depth_scale()
+
     print(f"  ✓ Pipeline started")
     print(f"  - Resolution: {intrinsics.width}x{intrinsics.height}")
     print(f"  - Focal length: fx={intrinsics.fx:.1f}, fy={intrinsics.fy:.1f}")
+    print(f"  - Depth scale: {depth_scale:.6f} m/unit")
 
     print("  - Stabilizing camera...")
     for i in range(30):
@@ -124,6 +175,62 @@ except Exception as e:
         pipeline.stop()
     sys.exit(1)
 
+# ============================================================
+# Capture / Send Threads
+# ============================================================
+# Capture runs ahead of YOLO and encode+send runs behind it, so camera wait,
+# GPU inference, and CPU encoding overlap. Each hand-off keeps only the newest
+# item (older ones are dropped, never queued up as latency).
+running = True
+capture_slot = deque(maxlen=1)  # (color_frame, depth_frame)
+capture_ready = threading.Event()
+send_slot = deque(maxlen=1)     # (frame refs, annotated image, sequence_id)
+send_ready = threading.Event()
+last_send_size = 0
+
+def capture_loop():
+    """Capture thread: keep the newest RealSense frame pair ready for YOLO"""
+    while running:
+        try:
+            frames = pipeline.wait_for_frames()
+        except RuntimeError as e:
+            if running:
+                print(f"Warning: Frame capture failed: {e}")
+            continue
+
+        depth_frame = frames.get_depth_frame()
+        color_frame = frames.get_color_frame()
+        if not depth_frame or not color_frame:
+            continue
+
+        capture_slot.append((color_frame, depth_frame))
+        capture_ready.set()
+
+def send_loop():
+    """Sender thread: JPEG-encode and send the newest annotated frame"""
+    global last_send_size
+    while running:
+        if not send_ready.wait(0.1):
+            continue
+        send_ready.clear()
+        try:
+            # Frame refs keep the RealSense buffer the image was drawn on alive
+            _frame_refs, image, sequence_id = send_slot.popleft()
+        except IndexError:
+            continue
+
+        try:
+            rgb_encoded = encode_jpeg(image)
+            # Size header (4 bytes) + JPEG bytes, joined in one copy
+            rgb_data = b''.join((struct.pack('!I', len(rgb_encoded)), rgb_encoded))
+            send_chunked_data(rgb_sock, rgb_data, MAC_IP, RGB_PORT, sequence_id)
+            last_send_size = len(rgb_data)
+        except Exception as e:
+            print(f"Warning: RGB send failed: {e}")
+
+capture_thread = threading.Thread(target=capture_loop, daemon=True)
+send_thread = threading.Thread(target=send_loop, daemon=True)
+
 # ============================================================
 # Main Loop
 # ============================================================
@@ -138,12 +245,16 @@ last_print_time = start_time
 yolo_time_total = 0.0
 
 try:
-    while True:
-        frames = pipeline.wait_for_frames()
-        depth_frame = frames.get_depth_frame()
-        color_frame = frames.get_color_frame()
+    capture_thread.start()
+    send_thread.start()
 
-        if not depth_frame or not color_frame:
+    while True:
+        if not capture_ready.wait(1.0):
+            continue
+        capture_ready.clear()
+        try:
+            color_frame, depth_frame = capture_slot.popleft()
+        except IndexError:
             continue
 
         depth_image = np.asanyarray(depth_frame.get_data())
@@ -151,30 +262,38 @@ try:
 
         # YOLO inference
         yolo_start = time.time()
-        results = model(color_image, conf=YOLO_CONF, verbose=False)
+        results = model(color_image, conf=YOLO_CONF, imgsz=YOLO_IMGSZ, verbose=False)
         yolo_time_total += time.time() - yolo_start
 
-        # Draw detections with distance
-        annotated_image = results[0].plot()
-        for box in results[0].boxes:
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
-
-            if 0 <= cx < REALSENSE_WIDTH and 0 <= cy < REALSENSE_HEIGHT:
-                distance = depth_frame.get_distance(cx, cy)
-                if distance > 0:
-                    label = f"{distance:.1f}m"
-                    cv2.putText(annotated_image, label, (x1, y1 - 25),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-
-        # Encode and send
-        try:
-            _, rgb_encoded = cv2.imencode('.jpg', annotated_image, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
-            # Convert to raw bytes with size header (4 bytes)
-            rgb_data = struct.pack('!I', len(rgb_encoded)) + rgb_encoded.tobytes()
-            send_chunked_data(rgb_sock, rgb_data, MAC_IP, RGB_PORT, frame_count)
-        except Exception as e:
-            print(f"Warning: RGB send failed: {e}")
+        # Detections as arrays (one device->host copy each)
+        boxes = results[0].boxes
+        xyxy_f = boxes.xyxy.cpu().numpy()
+        xyxy = xyxy_f.astype(np.int32)
+        class_ids = boxes.cls.cpu().numpy().astype(np.int32).tolist()
+        confs = boxes.conf.cpu().numpy().tolist()
+
+        # Box-center depths for all detections in one gather from the depth
+        # image (instead of a get_distance() call per box)
+        cx = (xyxy[:, 0] + xyxy[:, 2]) // 2
+        cy = (xyxy[:, 1] + xyxy[:, 3]) // 2
+        in_bounds = (cx >= 0) & (cx < REALSENSE_WIDTH) & (cy >= 0) & (cy < REALSENSE_HEIGHT)
+        distances = np.zeros(len(xyxy))
+        distances[in_bounds] = depth_image[cy[in_bounds], cx[in_bounds]] * depth_scale
+
+        # Draw detections with distance in one pass: each box's label carries
+        # "<class> <conf> <dist>m" (same boxes/colors as results[0].plot(),
+        # drawn on the camera frame, which is not used after inference)
+        annotator = Annotator(color_image, example=str(model.names))
+        for box, cls_id, conf, distance in zip(xyxy_f, class_ids, confs, distances.tolist()):
+            label = f"{model.names[cls_id]} {conf:.2f}"
+            if distance > 0:
+                label += f" {distance:.1f}m"
+            annotator.box_label(box, label, color=colors(cls_id, True))
+        annotated_image = annotator.result()
+
+        # Encode and send on the sender thread while the next frame runs YOLO
+        send_slot.append(((color_frame, depth_frame), annotated_image, frame_count))
+        send_ready.set()
 
         frame_count += 1
 
@@ -189,7 +308,7 @@ try:
             print(f"Frame {frame_count:5d} | FPS: {fps:5.1f} | "
                   f"YOLO: {avg_yolo_time:5.1f}ms | "
                   f"Objects: {num_detections:2d} | "
-                  f"Size: {len(rgb_data)/1024:.1f}KB")
+                  f"Size: {last_send_size/1024:.1f}KB")
 
             last_print_time = current_time
 
@@ -204,6 +323,11 @@ except Exception as e:
 
 finally:
     print("\nCleaning up resources...")
+    running = False
+    for thread in (capture_thread, send_thread):
+        if thread.is_alive():
+            thread.join(timeout=2.0)
+
     try:
         if pipeline_started:
             pipeline.stop()
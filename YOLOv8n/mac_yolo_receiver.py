@@ -9,50 +9,124 @@ import cv2
 import sys
 import time
 import struct
-from threading import Thread, Lock
-from collections import defaultdict
+from threading import Thread
 
 # ============================================================
 # Configuration
 # ============================================================
 RGB_PORT = 8889
-HEADER_SIZE = 12
+CHUNK_HEADER = struct.Struct('!III')  # sequence_id, chunk_index, total_chunks
+HEADER_SIZE = CHUNK_HEADER.size
 RECV_BUFFER_SIZE = 2 * 1024 * 1024
 MAX_UDP_PACKET = 65535
+CHUNK_SIZE = 60000   # Must match the sender's CHUNK_SIZE
+MAX_INFLIGHT = 4     # Frames reassembled concurrently
+MAX_FRAME_SIZE = 8 * 1024 * 1024  # Largest frame accepted (bounds the slot buffers)
+SEQ_RESTART_GAP = 64 # A sequence_id this far behind the newest means the sender restarted
+DISPLAY_IDLE_SLEEP = 0.001  # Display loop sleep when no new frame arrived (s)
+HAS_POLLKEY = hasattr(cv2, "pollKey")  # OpenCV >= 4.5.2 (else waitKey(1))
 
 # ============================================================
 # Shared State
 # ============================================================
+# Newest decoded frame, published by one reference assignment (atomic under
+# the GIL). The receiver never touches a frame after publishing it, so the
+# display reads and draws on it without a lock or a copy.
 rgb_image = None
-data_lock = Lock()
 frame_count = 0
 start_time = time.time()
 
 # ============================================================
 # Helper Functions
 # ============================================================
+class TextOverlay:
+    """
+    cv2.putText result cached as a sprite + mask, re-rendered only when the text changes
+
+    Drawing pastes the cached pixels into the frame (np.copyto with the mask),
+    so an unchanged label costs a small copy instead of glyph rasterization.
+    """
+    def __init__(self, org, color, scale=0.7, thickness=2):
+        self.org = org
+        self.color = color
+        self.scale = scale
+        self.thickness = thickness
+        self.text = None
+
+    def _render(self, text):
+        (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, self.scale, self.thickness)
+        pad = 2 * self.thickness  # Stroke overhang beyond the getTextSize box
+        x, y = self.org
+        self.x0, self.y0 = max(x - pad, 0), max(y - h - pad, 0)
+        sprite = np.zeros((y + baseline + pad - self.y0, x + w + pad - self.x0, 3), dtype=np.uint8)
+        cv2.putText(sprite, text, (x - self.x0, y - self.y0), cv2.FONT_HERSHEY_SIMPLEX,
+                    self.scale, self.color, self.thickness)
+        self.sprite = sprite
+        self.mask = sprite.any(axis=2, keepdims=True)
+        self.text = text
+
+    def draw(self, image, text):
+        if text != self.text:
+            self._render(text)
+        roi = image[self.y0:self.y0 + self.sprite.shape[0], self.x0:self.x0 + self.sprite.shape[1]]
+        rh, rw = roi.shape[:2]
+        np.copyto(roi, self.sprite[:rh, :rw], where=self.mask[:rh, :rw])
+
 def receive_chunked_data(sock):
-    """Receive and reassemble chunked UDP data"""
-    chunks_buffer = defaultdict(dict)
+    """
+    Receive and reassemble chunked UDP data
+
+    Each frame is written straight into a reusable bytearray slot (ring of
+    MAX_INFLIGHT, indexed by sequence_id) at chunk_index * CHUNK_SIZE, and
+    completion is tracked with a bitmask of received chunks. Yields a
+    memoryview of the slot, valid until the next iteration. Only frames newer
+    than the last one yielded come out; one completing late is dropped.
+    """
+    slot_seq = [-1] * MAX_INFLIGHT
+    slot_mask = [0] * MAX_INFLIGHT
+    slot_size = [0] * MAX_INFLIGHT
+    slot_buf = [bytearray() for _ in range(MAX_INFLIGHT)]
+    packet = bytearray(MAX_UDP_PACKET)
+    packet_view = memoryview(packet)
+    newest_seq = -1  # Last sequence_id yielded
+
+    def is_stale(seq, ref):
+        """seq is older than ref (not a restart of the sender's counter)"""
+        return ref - SEQ_RESTART_GAP < seq < ref
 
     while True:
         try:
-            packet, addr = sock.recvfrom(MAX_UDP_PACKET)
-
-            header = packet[:HEADER_SIZE]
-            sequence_id, chunk_index, total_chunks = struct.unpack('!III', header)
-            chunk_data = packet[HEADER_SIZE:]
-
-            chunks_buffer[sequence_id][chunk_index] = chunk_data
-
-            if len(chunks_buffer[sequence_id]) == total_chunks:
-                complete_data = b''.join(chunks_buffer[sequence_id][i] for i in range(total_chunks))
-
-                sequences = sorted(chunks_buffer.keys())
-                for old_seq in sequences[:-2]:
-                    del chunks_buffer[old_seq]
-
-                yield complete_data
+            n = sock.recv_into(packet)
+            sequence_id, chunk_index, total_chunks = CHUNK_HEADER.unpack_from(packet)
+            chunk_len = n - HEADER_SIZE
+            if (chunk_index >= total_chunks or chunk_len > CHUNK_SIZE
+                    or total_chunks * CHUNK_SIZE > MAX_FRAME_SIZE):
+                continue  # Malformed (or a stray datagram claiming a huge frame)
+
+            i = sequence_id % MAX_INFLIGHT
+            if slot_seq[i] != sequence_id:
+                if is_stale(sequence_id, slot_seq[i]):
+                    continue  # Late chunk of a frame whose slot was reused
+                # New frame: take over the slot (drops any older partial frame)
+                slot_seq[i] = sequence_id
+                slot_mask[i] = 0
+                if len(slot_buf[i]) < total_chunks * CHUNK_SIZE:
+                    slot_buf[i] = bytearray(total_chunks * CHUNK_SIZE)
+            elif slot_mask[i] == -1:
+                continue  # Duplicate chunk of a frame already yielded
+
+            start = chunk_index * CHUNK_SIZE
+            slot_buf[i][start:start + chunk_len] = packet_view[HEADER_SIZE:n]
+            slot_mask[i] |= 1 << chunk_index
+            if chunk_index == total_chunks - 1:
+                slot_size[i] = start + chunk_len
+
+            if slot_mask[i] == (1 << total_chunks) - 1:
+                slot_mask[i] = -1
+                if is_stale(sequence_id, newest_seq):
+                    continue  # A newer frame was already shown
+                newest_seq = sequence_id
+                yield memoryview(slot_buf[i])[:slot_size[i]]
 
         except Exception as e:
             print(f"Chunk receive error: {e}")
@@ -71,16 +145,14 @@ def receive_rgb():
     for complete_data in receive_chunked_data(sock):
         try:
             # Extract size header and encoded data
-            size = struct.unpack('!I', complete_data[:4])[0]
-            encoded_bytes = complete_data[4:4+size]
+            size = struct.unpack_from('!I', complete_data)[0]
 
-            # Convert bytes to numpy array
-            encoded_image = np.frombuffer(encoded_bytes, dtype=np.uint8)
+            # View the encoded bytes in place (no slice copy)
+            encoded_image = np.frombuffer(complete_data, dtype=np.uint8, count=size, offset=4)
             image = cv2.imdecode(encoded_image, cv2.IMREAD_COLOR)
 
-            with data_lock:
-                rgb_image = image
-                frame_count += 1
+            rgb_image = image
+            frame_count += 1
 
         except Exception as e:
             print(f"RGB decode error: {e}")
@@ -107,30 +179,37 @@ print("Press 'q' to quit")
 print("=" * 60)
 
 last_print_time = time.time()
+shown_rgb = None
+fps_overlay = TextOverlay((10, 30), (0, 255, 0))
+fps_text = "YOLO Detection | FPS: 0.0"  # Refreshed with the stats, once per second
 
 try:
     while True:
-        with data_lock:
-            current_rgb = rgb_image.copy() if rgb_image is not None else None
-
-        if current_rgb is not None:
-            elapsed = time.time() - start_time
-            fps = frame_count / elapsed if elapsed > 0 else 0
-
-            display_rgb = current_rgb.copy()
-            cv2.putText(display_rgb, f"YOLO Detection | FPS: {fps:.1f}", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        new_frame = False
 
-            cv2.imshow("YOLO + RealSense", display_rgb)
+        # Redraw only when the receiver has published a new frame
+        current_rgb = rgb_image
+        if current_rgb is not None and current_rgb is not shown_rgb:
+            shown_rgb = current_rgb
+            new_frame = True
+            fps_overlay.draw(current_rgb, fps_text)
+            cv2.imshow("YOLO + RealSense", current_rgb)
 
         current_time = time.time()
         if current_time - last_print_time >= 1.0:
             elapsed = current_time - start_time
             fps = frame_count / elapsed if elapsed > 0 else 0
             print(f"Frames: {frame_count:5d} | FPS: {fps:5.1f}")
+            fps_text = f"YOLO Detection | FPS: {fps:.1f}"
             last_print_time = current_time
 
-        key = cv2.waitKey(1) & 0xFF
+        if HAS_POLLKEY:
+            # Pump GUI events without waitKey's sleep; idle only between frames
+            key = cv2.pollKey() & 0xFF
+            if not new_frame:
+                time.sleep(DISPLAY_IDLE_SLEEP)
+        else:
+            key = cv2.waitKey(1) & 0xFF
         if key == ord('q'):
             break
 
@@ -5,6 +5,7 @@ LocoClient를 사용하지 않고 팔만 제어
 """
 import sys
 import time
+from types import MappingProxyType
 sys.path.insert(0, '/home/unitree/unitree_sdk2_python')
 
 from unitree_sdk2py.core.channel import ChannelFactoryInitialize
@@ -46,6 +47,10 @@ ARM_ACTIONS = {
     "release arm": 99,
 }
 
+# Read-only, casefolded once at import (inputs are casefolded to match)
+ARM_ACTIONS = MappingProxyType({k.casefold(): v for k, v in ARM_ACTIONS.items()})
+UNKNOWN_COMMAND_HELP = f"Unknown command. Available: {list(ARM_ACTIONS.keys())}"
+
 def main():
     print("=" * 60)
     print("G1 Arm Only Control")
@@ -76,7 +81,7 @@ def main():
 
     while True:
         try:
-            cmd = input("\nArm> ").strip().lower()
+            cmd = input("\nArm> ").strip().casefold()
 
             if cmd in ['q', 'quit', 'exit']:
                 break
@@ -98,7 +103,7 @@ def main():
                 else:
                     print(f"✗ Error code: {result}")
             else:
-                print(f"Unknown command. Available: {list(ARM_ACTIONS.keys())}")
+                print(UNKNOWN_COMMAND_HELP)
 
         except KeyboardInterrupt:
             print("\nExiting...")
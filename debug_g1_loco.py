@@ -5,12 +5,16 @@ This ensures the robot is in FSM 200 before sending Move commands
 """
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, '/home/unitree/unitree_sdk2_python')
 
 from unitree_sdk2py.core.channel import ChannelFactoryInitialize
 from unitree_sdk2py.g1.loco.g1_loco_client import LocoClient
 from unitree_sdk2py.g1.loco.g1_loco_api import ROBOT_API_ID_LOCO_GET_FSM_ID, ROBOT_API_ID_LOCO_GET_FSM_MODE
-import json
+try:
+    import orjson as json  # C parser for the FSM replies (same loads() API)
+except ImportError:
+    import json
 
 def get_fsm_id(client):
     """Get current FSM ID"""
@@ -26,13 +30,19 @@ def get_fsm_mode(client):
         return json.loads(data).get("data")
     return None
 
+def get_fsm_both(client):
+    """Get (FSM ID, FSM mode) with both DDS requests in flight at once"""
+    with ThreadPoolExecutor(2) as ex:
+        fsm_id = ex.submit(get_fsm_id, client)
+        fsm_mode = ex.submit(get_fsm_mode, client)
+        return fsm_id.result(), fsm_mode.result()
+
 def ensure_fsm_200(client):
     """
     Ensure robot is in FSM 200 (Start state) where Move commands work.
     This is the proper sequence to transition from any state to FSM 200.
     """
-    current_fsm = get_fsm_id(client)
-    current_mode = get_fsm_mode(client)
+    current_fsm, current_mode = get_fsm_both(client)
 
     print(f"Current FSM ID: {current_fsm}, Mode: {current_mode}")
 
@@ -55,7 +65,8 @@ def ensure_fsm_200(client):
     print("2. Standing up...")
     client.SetFsmId(4)
     time.sleep(2)
-    print(f"   FSM: {get_fsm_id(client)}, Mode: {get_fsm_mode(client)}")
+    fsm_id, fsm_mode = get_fsm_both(client)
+    print(f"   FSM: {fsm_id}, Mode: {fsm_mode}")
 
     # Step 3: Set stand height gradually
     print("3. Setting stand height...")
@@ -6,8 +6,8 @@ Smooth speaker output + microphone input with precise playback tracking
 
 import os, asyncio, json, base64, time, subprocess, re
 import websockets
-import audioop
 import queue
+import numpy as np
 from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
@@ -17,6 +17,12 @@ import prompts
 from unitree_sdk2py.core.channel import ChannelFactoryInitialize
 from unitree_sdk2py.g1.audio.g1_audio_client import AudioClient
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # ALSA microphone
 try:
     import alsaaudio
@@ -59,16 +65,103 @@ CHUNK_MS = 50
 BYTES_PER_SEC_16K = 16000 * 2
 CHUNK_BYTES_16K = BYTES_PER_SEC_16K * CHUNK_MS // 1000
 PREBUFFER_MS = 120
+G1_MAX_BATCH_CHUNKS = 4  # Backlogged chunks coalesced into one PlayStream call (one DDS round-trip)
 
 # ============================================================
 # Resample 24k -> 16k
 # ============================================================
+RESAMPLE_UP, RESAMPLE_DOWN = 2, 3  # 24k * 2 / 3 = 16k
+RESAMPLE_TAPS = 61                 # Low-pass taps at the 48k upsampled rate (~0.6ms delay)
+
+def design_resample_filter():
+    """Windowed-sinc anti-aliasing low-pass, cut off at the 8kHz output Nyquist"""
+    n = np.arange(RESAMPLE_TAPS) - (RESAMPLE_TAPS - 1) / 2
+    taps = np.sinc(n / RESAMPLE_DOWN) * np.kaiser(RESAMPLE_TAPS, 8.0)
+    # Gain RESAMPLE_UP makes up for the zero-stuffed samples (unity gain at DC)
+    return (taps * (RESAMPLE_UP / taps.sum())).astype(np.float32)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _polyphase_resample_kernel(buf, taps, j0, j1, up, down, out):
+        """
+        FIR outputs j0..j1-1 of `buf` zero-stuffed by `up` and decimated by `down`
+
+        Only the emitted outputs are computed, and only from taps that land on
+        real (non-stuffed) samples, so no upsampled array or full convolution.
+
+        Args:
+            buf: Input samples (float32)
+            taps: FIR taps at the upsampled rate
+            j0, j1: Range of outputs to compute (relative to buf[0])
+            up, down: Zero-stuffing and decimation factors
+            out: int16 output (>= j1 - j0), rounded and clipped
+        """
+        n_taps = taps.shape[0]
+        for i in range(j1 - j0):
+            pos = (j0 + i) * down  # Index in the upsampled stream
+            k = pos % up           # First tap on a real sample
+            src = (pos - k) // up  # ...and the input sample it lands on
+            acc = 0.0
+            while k < n_taps and src >= 0:
+                acc += np.float64(taps[k]) * buf[src]  # Exact product, as in the NumPy path
+                k += up
+                src -= 1
+            out[i] = min(max(np.rint(acc), -32768.0), 32767.0)
+
 class RateConverter24kTo16k:
+    """
+    Streaming 24k -> 16k PCM16 resampler (polyphase FIR: x2 zero-stuff, low-pass, /3)
+
+    The tail of each chunk is kept as filter history, so consecutive chunks
+    resample as one continuous signal (no clicks at chunk boundaries). Input and
+    output go through buffers that are reused across calls (grown when needed).
+    """
     def __init__(self):
-        self.state = None
+        self.taps = design_resample_filter()
+        self.work = np.empty(4800, dtype=np.float32)  # History + new input, as float32
+        self.out = np.empty(3200, dtype=np.int16)     # Resampled output (numba path)
+        self.history = self.work[:0]  # Input tail (view into work), starts on a multiple of RESAMPLE_DOWN
+        self.consumed = 0  # Input samples seen so far
+        self.next_out = 0  # Index of the next output sample to emit
+        if NUMBA_AVAILABLE:
+            # Compile (or load the cached kernel) now, not on the first audio chunk
+            _polyphase_resample_kernel(np.zeros(4, dtype=np.float32), self.taps, 0, 1,
+                                       RESAMPLE_UP, RESAMPLE_DOWN, np.empty(1, dtype=np.int16))
+
     def push(self, pcm16_24k_bytes: bytes) -> bytes:
-        out, self.state = audioop.ratecv(pcm16_24k_bytes, 2, 1, 24000, 16000, self.state)
-        return out
+        x = np.frombuffer(pcm16_24k_bytes, dtype=np.int16)
+        n_hist = len(self.history)
+        if len(self.work) < n_hist + len(x):
+            self.work = np.empty(2 * (n_hist + len(x)), dtype=np.float32)
+        buf = self.work[:n_hist + len(x)]
+        buf[:n_hist] = self.history  # Tail moved to the front (overlap-safe)
+        buf[n_hist:] = x             # int16 -> float32 in place
+        start = self.consumed - len(self.history)  # Input index of buf[0]
+        self.consumed += len(x)
+
+        # Output j of this buffer is output (first + j) of the whole stream
+        first = start * RESAMPLE_UP // RESAMPLE_DOWN
+        last = (self.consumed - 1) * RESAMPLE_UP // RESAMPLE_DOWN  # Newest output with all input here
+        j0, j1 = self.next_out - first, last - first + 1
+        self.next_out = max(self.next_out, last + 1)
+        if NUMBA_AVAILABLE:
+            if len(self.out) < j1 - j0:
+                self.out = np.empty(2 * (j1 - j0), dtype=np.int16)
+            out = self.out[:max(j1 - j0, 0)]
+            _polyphase_resample_kernel(buf, self.taps, j0, j1, RESAMPLE_UP, RESAMPLE_DOWN, out)
+        else:
+            # float64 like the numba kernel's accumulator, so both round alike
+            upsampled = np.zeros(len(buf) * RESAMPLE_UP, dtype=np.float64)
+            upsampled[::RESAMPLE_UP] = buf
+            y = np.convolve(upsampled, self.taps.astype(np.float64))[::RESAMPLE_DOWN][j0:j1]
+            out = np.clip(np.rint(y), -32768, 32767).astype(np.int16)
+
+        # Keep enough input to cover the filter span for the next chunk
+        keep_from = self.consumed - (RESAMPLE_TAPS // RESAMPLE_UP + RESAMPLE_DOWN)
+        keep_from = max(keep_from - keep_from % RESAMPLE_DOWN, start)
+        self.history = buf[keep_from - start:]
+
+        return out.tobytes()
 
 # ============================================================
 # Helper: Find microphone
@@ -245,20 +338,26 @@ async def main():
                             continue
 
                     if len(buffer16k) >= CHUNK_BYTES_16K:
-                        chunk = bytes(buffer16k[:CHUNK_BYTES_16K])
-                        del buffer16k[:CHUNK_BYTES_16K]
+                        # A backlog (the API delivers audio in bursts) goes out as
+                        # one PlayStream call instead of one blocking call per chunk
+                        n_chunks = min(len(buffer16k) // CHUNK_BYTES_16K, G1_MAX_BATCH_CHUNKS)
+                        n_bytes = n_chunks * CHUNK_BYTES_16K
+                        chunk = bytes(buffer16k[:n_bytes])
+                        del buffer16k[:n_bytes]
                         try:
                             ac.PlayStream(APP_NAME, stream_id, chunk)
                         except TypeError:
                             ac.PlayStream(APP_NAME, stream_id, list(chunk))
                         
-                        # ★ Track playback: (send_time, chunk_duration)
+                        # ★ Track playback: (send_time, chunk_duration) per chunk, with
+                        # batched chunks timed as if sent one pacing step apart
                         send_time = time.time()
                         chunk_duration = CHUNK_MS / 1000.0  # 0.05 seconds
-                        playback_queue.append((send_time, chunk_duration))
+                        for k in range(n_chunks):
+                            playback_queue.append((send_time + k * chunk_duration * 0.9, chunk_duration))
                         
                         playing = True
-                        await asyncio.sleep(CHUNK_MS/1000.0 * 0.9)
+                        await asyncio.sleep(n_chunks * CHUNK_MS/1000.0 * 0.9)
                     else:
                         await asyncio.sleep(0.005)
 